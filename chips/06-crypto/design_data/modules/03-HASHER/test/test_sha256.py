@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 import cocotb
@@ -12,6 +13,10 @@ import random
 
 os.environ['COCOTB_ANSI_OUTPUT'] = '1'
 
+# reference model with per round trace, see compare_rounds()
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "pythonPOC"))
+from sha256 import SHA256 as TracedSHA256
+
 class SHA256:
     # all 32 bit unsigned ints
 
@@ -138,6 +143,29 @@ class Sha256Tester:
         while self.finished_chunk_p.value == 0:
             await RisingEdge(self.clk)
 
+    async def compare_rounds(self, rounds) -> int | None:
+        """Compare a..h and w[i] against one block of TracedSHA256.get_trace() every cycle.
+
+        Has to be called right after the rising edge that took msg_ready_p,
+        returns the first round that differs or None if all 64 match.
+        """
+        registers = [self.dut.a, self.dut.b, self.dut.c, self.dut.d,
+                     self.dut.e, self.dut.f, self.dut.g, self.dut.h]
+        for i in range(64):
+            await ReadOnly()
+            w = int(str(self.dut.w.value), base=2)
+            rtl = [int(str(register.value), base=2) for register in registers]
+            rtl.append((w >> (32 * i)) & 0xffffffff)
+            expected = [int(value) for value in rounds[i]]
+            if rtl != expected:
+                names = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'w']
+                diff = ", ".join(f"{name}: {hex(got)} != {hex(want)}"
+                                 for name, got, want in zip(names, rtl, expected) if got != want)
+                self.dut._log.info(f"Round {i} diverges, {diff}")
+                return i
+            await RisingEdge(self.clk)
+        return None
+
 @cocotb.test()
 async def test_init_parameter(dut):
     tester = Sha256Tester(dut)
@@ -189,6 +217,33 @@ async def test_sha256(dut):
 
     dut._log.info("✓ SHA256 test passed")
 
+@cocotb.test()
+async def test_sha256_rounds(dut):
+    tester = Sha256Tester(dut)
+    # Start clock
+    clock = Clock(dut.clk, 10, unit="us")
+    cocotb.start_soon(clock.start())
+    await tester.reset()
+    sha256 = TracedSHA256(trace=True)
+
+    for chunk in range(2):
+        message_bytes = random.randbytes(512 // 8)
+        message_bits = ''.join(format(byte, '08b') for byte in message_bytes)
+        message_32_bits = [message_bits[i:i+32] for i in range(0, len(message_bits), 32)][::-1]
+        sha256.hash_chunk(message_bytes)
+        tester.message.value = "".join(bit for bit in message_32_bits)
+        tester.msg_ready_p.value = 1
+        await RisingEdge(tester.clk)
+        tester.msg_ready_p.value = 0
+
+        diverging_round = await tester.compare_rounds(sha256.get_trace()[chunk])
+        assert diverging_round is None, f"Chunk {chunk} diverges from the model in round {diverging_round}"
+        await tester.wait_done()
+        assert int(str(tester.hash.value), base=2) == sha256._get_hash(), f"Hash of chunk {chunk} not correct"
+        await RisingEdge(tester.clk)
+
+    dut._log.info("✓ SHA256 round trace test passed")
+
 def test_sha256_runner():
     sim = os.getenv("SIM", "icarus")
 
@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+from typing import Callable
+
+from curve import CurveFp
+from ecdsa import Ecdsa, PubkeyTableCache
+from field import Secp256k1Field
+from field_limbs import LimbField
+from sha256 import SHA256
+
+# results of all runs, next to this file and ignored by git
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks.json")
+
+
+def _sha256_blocks(size: int) -> tuple[Callable[[], None], int]:
+    msg = random.randbytes(size)
+
+    def run():
+        sha256 = SHA256()
+        sha256.update(msg)
+        sha256.digest()
+    return run, size // 64 + 1  # compressed blocks incl. padding
+
+
+def _curve_mul(bits: int, method: str = "affine") -> tuple[Callable[[], None], int]:
+    ecdsa = Ecdsa()
+    k = random.getrandbits(bits) | (1 << (bits - 1))
+    return lambda: ecdsa.ec_curve.mul(k, ecdsa.generator, method=method), 1
+
+
+def _curve_multi_mul(count: int, pippenger: bool) -> tuple[Callable[[], None], int]:
+    curve = CurveFp()
+    G = Ecdsa().generator
+    points = curve.mul_many([random.randrange(1, curve.n) for _ in range(count)], G)
+    scalars = [random.randrange(1, curve.n) for _ in range(count)]
+    if pippenger:
+        return lambda: curve.multi_mul(scalars, points), count
+    return lambda: curve.mul_straus(scalars, points), count  # rates in terms/s
+
+
+def _field_reduce(fold: bool) -> tuple[Callable[[], None], int]:
+    field = Secp256k1Field()
+    products = [random.randrange(field.p) * random.randrange(field.p) for _ in range(1000)]
+    if fold:
+        return lambda: [field.reduce(x) for x in products], len(products)
+    p = field.p
+    return lambda: [x % p for x in products], len(products)
+
+
+def _field_mul_limbs() -> tuple[Callable[[], None], int]:
+    field = LimbField()
+    a = field.to_limbs([random.randrange(field.p) for _ in range(1000)])
+    b = field.to_limbs([random.randrange(field.p) for _ in range(1000)])
+    return lambda: field.mul(a, b), len(a)
+
+
+def _ecdsa_sign() -> tuple[Callable[[], None], int]:
+    ecdsa = Ecdsa()
+    privkey = random.randrange(1, ecdsa.order)
+    return lambda: ecdsa.sign("benchmark", privkey), 1
+
+
+def _ecdsa_verify(cached: bool = False) -> tuple[Callable[[], None], int]:
+    ecdsa = Ecdsa()
+    if cached:
+        ecdsa.pubkey_cache = PubkeyTableCache(ecdsa)
+    privkey = random.randrange(1, ecdsa.order)
+    pubkey = ecdsa.ec_curve.mul(privkey, ecdsa.generator)
+    sig = ecdsa.sign("benchmark", privkey)
+    return lambda: ecdsa.verify("benchmark", sig, pubkey), 1
+
+
+def _ecdsa_verify_batch(count: int) -> tuple[Callable[[], None], int]:
+    ecdsa = Ecdsa()
+    keys = [random.randrange(1, ecdsa.order) for _ in range(count)]
+    pubkeys = ecdsa.ec_curve.mul_many(keys, ecdsa.generator)
+    msgs = [f"benchmark {i}" for i in range(count)]
+    sigs = [ecdsa.sign(msg, privkey, recoverable=True) for msg, privkey in zip(msgs, keys)]
+    return lambda: ecdsa.verify_batch(msgs, sigs, pubkeys), count
+
+
+# name -> factory returning (callable, operations per call), rates are reported in operations/s
+BENCHMARKS: dict[str, Callable[[], tuple[Callable[[], None], int]]] = {
+    'sha256_blocks_64B': lambda: _sha256_blocks(64),
+    'sha256_blocks_1KiB': lambda: _sha256_blocks(1024),
+    'sha256_blocks_16KiB': lambda: _sha256_blocks(16 * 1024),
+    'curve_mul_32bit': lambda: _curve_mul(32),
+    'curve_mul_128bit': lambda: _curve_mul(128),
+    'curve_mul_256bit': lambda: _curve_mul(256),
+    'curve_mul_jacobian_256bit': lambda: _curve_mul(256, "jacobian"),
+    'curve_mul_wnaf_256bit': lambda: _curve_mul(256, "wnaf"),
+    'curve_mul_glv_256bit': lambda: _curve_mul(256, "glv"),
+    'curve_mul_ladder_256bit': lambda: _curve_mul(256, "ladder"),
+    'curve_multi_mul_straus_256': lambda: _curve_multi_mul(256, False),
+    'curve_multi_mul_pippenger_256': lambda: _curve_multi_mul(256, True),
+    'field_reduce_generic': lambda: _field_reduce(False),
+    'field_reduce_fold': lambda: _field_reduce(True),
+    'field_mul_limbs': _field_mul_limbs,
+    'ecdsa_sign': _ecdsa_sign,
+    'ecdsa_verify': _ecdsa_verify,
+    'ecdsa_verify_cached_key': lambda: _ecdsa_verify(cached=True),
+    'ecdsa_verify_batch_64': lambda: _ecdsa_verify_batch(64),
+    'ecdsa_verify_batch_1024': lambda: _ecdsa_verify_batch(1024),
+}
+
+
+def measure(run: Callable[[], None], ops_per_call: int, min_time: float, repeat: int = 3) -> float:
+    """Best rate in operations/s of repeat rounds, each round runs for at least min_time."""
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            seconds = time.perf_counter() - start
+            if seconds >= min_time:
+                break
+        best = max(best, calls * ops_per_call / seconds)
+    return best
+
+
+def run_benchmarks(min_time: float, names: list[str] | None = None) -> dict[str, float]:
+    random.seed(1337)
+    results = {}
+    for name in names or BENCHMARKS:
+        run, ops_per_call = BENCHMARKS[name]()
+        results[name] = measure(run, ops_per_call, min_time)
+    return results
+
+
+def find_regressions(current: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Benchmarks whose rate dropped by more than threshold (0.1 = 10%) compared to baseline."""
+    regressions = []
+    for name, rate in current.items():
+        if name in baseline and rate < baseline[name] * (1 - threshold):
+            regressions.append(f"{name}: {rate:.1f}/s < {baseline[name]:.1f}/s - {threshold:.0%}")
+    return regressions
+
+
+def current_commit() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit.stdout.strip()
+
+
+def load_results(path: str) -> dict[str, dict[str, float]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='benchmark',
+        description='Throughput of the pythonPOC crypto models, stored per commit and compared to a baseline'
+    )
+
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--results', default=RESULTS_PATH, help='json file with the results per commit')
+    parser.add_argument('--baseline', default=None, help='commit to compare against (default: last stored other commit)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown, 0.2 = 20%% (default)')
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds per measurement round')
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+
+    args = parser.parse_args()
+
+    commit = current_commit()
+    results = load_results(args.results)
+    current = run_benchmarks(args.min_time, args.names or None)
+    for name, rate in current.items():
+        print(f"{name:<24} {rate:>14.1f} ops/s")
+
+    baseline_commit = args.baseline or next((c for c in reversed(results) if c != commit), None)
+    regressions = []
+    if baseline_commit is not None:
+        regressions = find_regressions(current, results.get(baseline_commit, {}), args.threshold)
+        print(f"[Baseline] {baseline_commit}: {len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"\t{regression}")
+
+    if not args.no_save:
+        results.pop(commit, None)  # keep the insertion order chronological
+        results[commit] = current
+        with open(args.results, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    raise SystemExit(1 if regressions else 0)
@@ -1,8 +1,22 @@
+import os
+import sys
+
+
 class CurveFp:
     def __init__(self):
         self.p = 115792089237316195423570985008687907853269984665640564039457584007908834671663
         self.a = 0
         self.b = 7
+        self.n = 115792089237316195423570985008687907852837564279074904382605163141518161494337  # group order
+
+        # GLV endomorphism (x, y) -> (beta*x, y) = lambda*(x, y) and the
+        # short lattice basis (a1, b1), (a2, b2) used to split scalars
+        self.beta = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+        self.lam = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+        self.glv_a1 = 0x3086D221A7D46BCDE86C90E49284EB15
+        self.glv_b1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+        self.glv_a2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+        self.glv_b2 = 0x3086D221A7D46BCDE86C90E49284EB15
 
     def is_on_curve(self, P) -> bool:
         if P is None:  # point at infinity
@@ -38,6 +52,22 @@ class CurveFp:
                 x2 = (x2 - x1) % p
         return x1 % p if u == 1 else x2 % p
 
+    def lift_x(self, x: int, parity: int) -> tuple[int, int] | None:
+        """The point with x coordinate x and y of the given parity, None if there is none.
+
+        Uses y = (x^3 + a*x + b)^((p+1)/4), valid since p = 3 mod 4.
+        """
+        p = self.p
+        if not 0 <= x < p:
+            return None
+        y2 = (x * x * x + self.a * x + self.b) % p
+        y = pow(y2, (p + 1) // 4, p)
+        if (y * y) % p != y2:
+            return None
+        if (y & 1) != (parity & 1):
+            y = p - y
+        return (x, y)
+
     def neg(self, P) -> tuple[int, int] | None:
         if P is None:
             return None
@@ -77,8 +107,24 @@ class CurveFp:
         y3 = (lam * (x1 - x3) - y1) % p
         return (x3, y3)
 
-    def mul(self, k: int, P) -> tuple[int, int] | None:
-        """Scalar multiplication k*P using double-and-add (left-to-right)."""
+    def mul(self, k: int, P, method: str = "affine", window: int = 4) -> tuple[int, int] | None:
+        """Scalar multiplication k*P using double-and-add (left-to-right).
+
+        method selects the implementation, "affine" (default) inverts on every
+        add, "jacobian" only once at the end, "wnaf" uses a width-window NAF,
+        "glv" splits k into two half length scalars first and "ladder" runs a
+        Montgomery ladder with the same operation sequence for every k.
+        """
+        if method == "jacobian":
+            return self.mul_jacobian(k, P)
+        if method == "wnaf":
+            return self.mul_wnaf(k, P, window)
+        if method == "glv":
+            return self.mul_glv(k, P, window)
+        if method == "ladder":
+            return self.mul_ladder(k, P)
+        if method != "affine":
+            raise ValueError(f"Unknown scalar multiplication method {method}")
         if k < 0:
             return self.mul(-k, self.neg(P))
         result = None
@@ -91,3 +137,552 @@ class CurveFp:
             k >>= 1
 
         return result
+
+    # Jacobian coordinates: (X, Y, Z) stands for the affine point (X/Z^2, Y/Z^3),
+    # None is the point at infinity as in the affine case.
+
+    def to_jacobian(self, P) -> tuple[int, int, int] | None:
+        if P is None:
+            return None
+        x, y = P
+        return (x, y, 1)
+
+    def to_affine(self, P) -> tuple[int, int] | None:
+        """Back to affine coordinates, the only inversion of a Jacobian computation."""
+        if P is None:
+            return None
+        X, Y, Z = P
+        p = self.p
+        z_inv = self.inv_mod_binary(Z, p)
+        z_inv2 = (z_inv * z_inv) % p
+        return ((X * z_inv2) % p, (Y * z_inv2 * z_inv) % p)
+
+    def jacobian_double(self, P) -> tuple[int, int, int] | None:
+        if P is None:
+            return None
+        X, Y, Z = P
+        p = self.p
+        if Y == 0:
+            return None
+        XX = (X * X) % p
+        YY = (Y * Y) % p
+        YYYY = (YY * YY) % p
+        S = (4 * X * YY) % p
+        M = 3 * XX
+        if self.a:
+            ZZ = (Z * Z) % p
+            M += self.a * ZZ * ZZ
+        M %= p
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YYYY) % p
+        Z3 = (2 * Y * Z) % p
+        return (X3, Y3, Z3)
+
+    def jacobian_add_mixed(self, P, Q) -> tuple[int, int, int] | None:
+        """Jacobian P plus affine Q, cheaper than a full Jacobian add since Z2 = 1."""
+        if Q is None:
+            return P
+        if P is None:
+            return self.to_jacobian(Q)
+        X1, Y1, Z1 = P
+        x2, y2 = Q
+        p = self.p
+        Z1Z1 = (Z1 * Z1) % p
+        U2 = (x2 * Z1Z1) % p
+        S2 = (y2 * Z1 * Z1Z1) % p
+        H = (U2 - X1) % p
+        r = (S2 - Y1) % p
+        if H == 0:
+            return self.jacobian_double(P) if r == 0 else None
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        V = (X1 * HH) % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - Y1 * HHH) % p
+        Z3 = (Z1 * H) % p
+        return (X3, Y3, Z3)
+
+    def jacobian_add(self, P, Q) -> tuple[int, int, int] | None:
+        if P is None:
+            return Q
+        if Q is None:
+            return P
+        X1, Y1, Z1 = P
+        X2, Y2, Z2 = Q
+        p = self.p
+        Z1Z1 = (Z1 * Z1) % p
+        Z2Z2 = (Z2 * Z2) % p
+        U1 = (X1 * Z2Z2) % p
+        U2 = (X2 * Z1Z1) % p
+        S1 = (Y1 * Z2 * Z2Z2) % p
+        S2 = (Y2 * Z1 * Z1Z1) % p
+        H = (U2 - U1) % p
+        r = (S2 - S1) % p
+        if H == 0:
+            return self.jacobian_double(P) if r == 0 else None
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        V = (U1 * HH) % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - S1 * HHH) % p
+        Z3 = (Z1 * Z2 * H) % p
+        return (X3, Y3, Z3)
+
+    def jacobian_neg(self, P) -> tuple[int, int, int] | None:
+        if P is None:
+            return None
+        X, Y, Z = P
+        return (X, (self.p - Y) % self.p, Z)
+
+    def mul_jacobian(self, k: int, P) -> tuple[int, int] | None:
+        """k*P with left-to-right double-and-add in Jacobian coordinates, one inversion in total."""
+        if k < 0:
+            return self.mul_jacobian(-k, self.neg(P))
+        if P is None:
+            return None
+        result = None
+        for bit in bin(k)[2:]:
+            result = self.jacobian_double(result)
+            if bit == "1":
+                result = self.jacobian_add_mixed(result, P)
+        return self.to_affine(result)
+
+    @staticmethod
+    def wnaf(k: int, w: int) -> list[int]:
+        """Width-w NAF digits of k >= 0, least significant first.
+
+        Every digit is 0 or odd with |d| < 2^(w-1) and any w consecutive
+        digits hold at most one non zero one.
+        """
+        if w < 2:
+            raise ValueError("wNAF window has to be at least 2")
+        digits = []
+        while k > 0:
+            if k & 1:
+                d = k & ((1 << w) - 1)
+                if d >= 1 << (w - 1):
+                    d -= 1 << w
+                k -= d
+            else:
+                d = 0
+            digits.append(d)
+            k >>= 1
+        return digits
+
+    def wnaf_op_counts(self, k: int, w: int) -> dict[str, int]:
+        """Point operations mul_wnaf(k, P, w) performs, next to plain double-and-add.
+
+        The precomputation of the odd multiples P, 3P, .., (2^(w-1)-1)P is
+        counted separately, it could be shared between calls with the same P.
+        """
+        digits = self.wnaf(abs(k), w)
+        table_size = 1 << (w - 2)
+        bits = bin(abs(k))[2:] if k else ""
+        return {
+            "doublings": max(len(digits) - 1, 0),
+            "additions": max(sum(1 for d in digits if d) - 1, 0),
+            "precomp_doublings": 1 if table_size > 1 else 0,
+            "precomp_additions": table_size - 1,
+            "binary_doublings": max(len(bits) - 1, 0),
+            "binary_additions": max(bits.count("1") - 1, 0),
+        }
+
+    def odd_multiples(self, P, w: int) -> list[tuple[int, int, int]]:
+        """P, 3P, 5P, .., (2^(w-1)-1)P in Jacobian coordinates, the wNAF lookup table."""
+        table = [self.to_jacobian(P)]
+        if len(table) < 1 << (w - 2):
+            twoP = self.jacobian_double(table[0])
+            for _ in range((1 << (w - 2)) - 1):
+                table.append(self.jacobian_add(table[-1], twoP))
+        return table
+
+    def mul_wnaf(self, k: int, P, w: int = 4) -> tuple[int, int] | None:
+        """k*P with a width-w NAF in Jacobian coordinates.
+
+        Negative digits just negate a table entry, so only the 2^(w-2) odd
+        multiples have to be precomputed and on average one addition is
+        needed every w+1 bits instead of every second bit.
+        """
+        if k < 0:
+            return self.mul_wnaf(-k, self.neg(P), w)
+        if P is None:
+            return None
+        digits = self.wnaf(k, w)
+        table = self.odd_multiples(P, w)
+
+        result = None
+        for d in reversed(digits):
+            result = self.jacobian_double(result)
+            if d > 0:
+                result = self.jacobian_add(result, table[d >> 1])
+            elif d < 0:
+                result = self.jacobian_add(result, self.jacobian_neg(table[(-d) >> 1]))
+        return self.to_affine(result)
+
+    def mul_straus(self, scalars: list[int], points: list, w: int = 4) -> tuple[int, int] | None:
+        """sum(k_i * P_i) with Straus' method (Shamir's trick with interleaved wNAF windows).
+
+        All terms share one doubling chain, so u1*G + u2*Q costs about one
+        scalar multiplication worth of doublings instead of two. Each point
+        gets its own odd multiple table, the additions are the same as in
+        mul_wnaf().
+        """
+        return self.to_affine(self.straus_jacobian(scalars, points, w))
+
+    def straus_jacobian(self, scalars: list[int], points: list, w: int = 4) -> tuple[int, int, int] | None:
+        """mul_straus() without the final inversion."""
+        nafs = []
+        tables = []
+        for k, P in zip(scalars, points, strict=True):
+            if k < 0:
+                k, P = -k, self.neg(P)
+            if k == 0 or P is None:
+                continue
+            nafs.append(self.wnaf(k, w))
+            tables.append(self.odd_multiples(P, w))
+
+        result = None
+        for i in reversed(range(max((len(digits) for digits in nafs), default=0))):
+            result = self.jacobian_double(result)
+            for digits, table in zip(nafs, tables):
+                d = digits[i] if i < len(digits) else 0
+                if d > 0:
+                    result = self.jacobian_add(result, table[d >> 1])
+                elif d < 0:
+                    result = self.jacobian_add(result, self.jacobian_neg(table[(-d) >> 1]))
+        return result
+
+    @staticmethod
+    def pippenger_window(count: int, bits: int = 256) -> int:
+        """Bucket window c that minimizes the additions of multi_mul() for count points.
+
+        Each of the ceil(bits / c) windows costs count bucket additions and
+        about 2^(c+1) to sum the buckets up, so c grows with log2(count).
+        """
+        return min(range(1, 21), key=lambda c: -(-bits // c) * (count + 2 ** (c + 1)))
+
+    def multi_mul(self, scalars: list[int], points: list, window: int | None = None) -> tuple[int, int] | None:
+        """sum(k_i * P_i) with Pippenger's bucket method, for hundreds of terms and more.
+
+        Per window of c bits every point is added once into the bucket of
+        its digit, the buckets are then weighted with a running sum. The
+        doublings are shared by all terms as in mul_straus() and there are
+        no per point tables, so the cost per term drops as the batch grows.
+        """
+        return self.to_affine(self.pippenger_jacobian(scalars, points, window))
+
+    def pippenger_jacobian(self, scalars: list[int], points: list,
+                           window: int | None = None) -> tuple[int, int, int] | None:
+        """multi_mul() without the final inversion."""
+        terms = []
+        for k, P in zip(scalars, points, strict=True):
+            if k < 0:  # keeps short negative scalars (e.g. from glv_split()) short
+                k, P = -k, self.neg(P)
+            k %= self.n
+            if k and P is not None:
+                terms.append((k, P))
+        if not terms:
+            return None
+        bits = max(k.bit_length() for k, _ in terms)
+        c = window or self.pippenger_window(len(terms), bits)
+        mask = (1 << c) - 1
+
+        result = None
+        for shift in reversed(range(0, bits, c)):
+            for _ in range(c):
+                result = self.jacobian_double(result)
+            buckets = [None] * (1 << c)
+            for k, P in terms:
+                d = (k >> shift) & mask
+                if d:
+                    buckets[d] = self.jacobian_add_mixed(buckets[d], P)
+            # sum(d * bucket[d]) as the sum of all running sums from the top bucket down
+            running = None
+            total = None
+            for bucket in reversed(buckets[1:]):
+                running = self.jacobian_add(running, bucket)
+                total = self.jacobian_add(total, running)
+            result = self.jacobian_add(result, total)
+        return result
+
+    def endomorphism(self, P) -> tuple[int, int] | None:
+        """lambda*P for the price of one field multiplication."""
+        if P is None:
+            return None
+        x, y = P
+        return ((self.beta * x) % self.p, y)
+
+    def glv_split(self, k: int) -> tuple[int, int]:
+        """k1, k2 with k = k1 + k2*lambda mod n and |k1|, |k2| of about 128 bits."""
+        n = self.n
+        k %= n
+        c1 = (self.glv_b2 * k + n // 2) // n
+        c2 = (-self.glv_b1 * k + n // 2) // n
+        k1 = k - c1 * self.glv_a1 - c2 * self.glv_a2
+        k2 = -c1 * self.glv_b1 - c2 * self.glv_b2
+        return k1, k2
+
+    def mul_glv(self, k: int, P, w: int = 4) -> tuple[int, int] | None:
+        """k*P as k1*P + k2*lambda(P) with mul_straus(), half the doublings of mul_wnaf().
+
+        P has to be in the group generated by the curve generator (true for
+        every point on secp256k1, the cofactor is 1).
+        """
+        k1, k2 = self.glv_split(k)
+        return self.mul_straus([k1, k2], [P, self.endomorphism(P)], w)
+
+    def inv_many(self, values: list[int], p: int) -> list[int]:
+        """Inverses of all values mod p with a single inv_mod_binary (Montgomery's trick).
+
+        Costs one inversion plus 3(n-1) multiplications: the running products
+        are inverted once and the single inverses are peeled off backwards.
+        """
+        prefix = []  # prefix[i] = values[0] * .. * values[i-1]
+        acc = 1
+        for v in values:
+            prefix.append(acc)
+            acc = (acc * v) % p
+        inv = self.inv_mod_binary(acc, p) if values else 1  # raises ZeroDivisionError for any zero
+        result = [0] * len(values)
+        for i in reversed(range(len(values))):
+            result[i] = (inv * prefix[i]) % p
+            inv = (inv * values[i]) % p
+        return result
+
+    def normalize_many(self, points: list) -> list[tuple[int, int] | None]:
+        """to_affine() of a list of Jacobian points, one inversion for all of them."""
+        p = self.p
+        finite = [P for P in points if P is not None]
+        z_invs = iter(self.inv_many([Z for _, _, Z in finite], p))
+        result = []
+        for P in points:
+            if P is None:
+                result.append(None)
+                continue
+            X, Y, _ = P
+            z_inv = next(z_invs)
+            z_inv2 = (z_inv * z_inv) % p
+            result.append(((X * z_inv2) % p, (Y * z_inv2 * z_inv) % p))
+        return result
+
+    def mul_many(self, scalars: list[int], P, w: int = 4) -> list[tuple[int, int] | None]:
+        """k*P for many k with the GLV path, all results normalized with one inversion."""
+        Q = self.endomorphism(P)
+        return self.normalize_many([self.straus_jacobian(list(self.glv_split(k)), [P, Q], w) for k in scalars])
+
+    # x-only Montgomery ladder (Brier-Joye formulas): (X, Z) stands for the
+    # affine x = X/Z, Z = 0 is the point at infinity.
+
+    def inv_mod_fermat(self, a, p) -> int:
+        """a^(p-2) mod p, a fixed square-and-multiply chain unlike inv_mod_binary()."""
+        return pow(a, p - 2, p)
+
+    @staticmethod
+    def cswap(bit: int, A: tuple[int, int], B: tuple[int, int]) -> tuple[tuple[int, int], tuple[int, int]]:
+        """(B, A) if bit else (A, B), with masks instead of a branch."""
+        mask = -bit
+        tx = mask & (A[0] ^ B[0])
+        tz = mask & (A[1] ^ B[1])
+        return (A[0] ^ tx, A[1] ^ tz), (B[0] ^ tx, B[1] ^ tz)
+
+    def ladder_double(self, P: tuple[int, int]) -> tuple[int, int]:
+        X, Z = P
+        p = self.p
+        XX = (X * X) % p
+        ZZ = (Z * Z) % p
+        ZZZ = (ZZ * Z) % p
+        T = XX
+        if self.a:
+            T = (XX - self.a * ZZ) % p
+        X2 = (T * T - 8 * self.b * ((X * ZZZ) % p)) % p
+        U = X * XX + self.b * ZZZ
+        if self.a:
+            U += self.a * ((X * ZZ) % p)
+        Z2 = (4 * Z * (U % p)) % p
+        return (X2, Z2)
+
+    def ladder_add(self, P: tuple[int, int], Q: tuple[int, int], x_diff: int) -> tuple[int, int]:
+        """x(P + Q) from x(P), x(Q) and the affine x of P - Q."""
+        Xm, Zm = P
+        Xn, Zn = Q
+        p = self.p
+        XmZn = (Xm * Zn) % p
+        XnZm = (Xn * Zm) % p
+        ZmZn = (Zm * Zn) % p
+        T = (Xm * Xn) % p
+        if self.a:
+            T = (T - self.a * ZmZn) % p
+        X3 = (T * T - 4 * self.b * ((ZmZn * (XmZn + XnZm)) % p)) % p
+        D = (XmZn - XnZm) % p
+        Z3 = (x_diff * ((D * D) % p)) % p
+        return (X3, Z3)
+
+    def ladder_recover(self, P: tuple[int, int], R0: tuple[int, int], R1: tuple[int, int]) -> tuple[int, int]:
+        """Affine k*P from the ladder outputs R0 = x(k*P), R1 = x((k+1)*P) (Okeya-Sakurai)."""
+        x, y = P
+        X1, Z1 = R0
+        X2, Z2 = R1
+        p = self.p
+        Z1Z2 = (Z1 * Z2) % p
+        Z1Z1Z2 = (Z1 * Z1Z2) % p
+        xZ1 = (x * Z1) % p
+        A = (xZ1 - X1) % p
+        N = (2 * self.b * Z1Z1Z2
+             + ((((self.a * Z1 + x * X1) % p) * (xZ1 + X1)) % p) * Z2
+             - X2 * ((A * A) % p)) % p
+        yZ = (2 * y * Z1Z2) % p
+        D_inv = self.inv_mod_fermat((yZ * Z1) % p, p)  # 1 / (2 y Z1^2 Z2)
+        return ((X1 * yZ * D_inv) % p, (N * D_inv) % p)
+
+    def mul_ladder(self, k: int, P) -> tuple[int, int] | None:
+        """k*P with one ladder_add and one ladder_double for each of the n.bit_length() + 1 bits.
+
+        k is replaced by k + n or k + 2n, whichever has bit n.bit_length()
+        set, so every scalar has the same length and the ladder never sees
+        the point at infinity after the first step. The swaps are branch free
+        and the final inversion is a fixed exponentiation, so the sequence of
+        field operations does not depend on k. Only k = 0 and k = n - 1
+        (results at infinity) take a different path after the ladder.
+        """
+        if P is None:
+            return None
+        n = self.n
+        bits = n.bit_length() + 1
+        k = k % n + 2 * n
+        k -= ((k - n) >> (bits - 1)) * n
+        R0, R1 = (1, 0), (P[0], 1)  # infinity, P
+        swap = 0
+        for i in reversed(range(bits)):
+            bit = (k >> i) & 1
+            R0, R1 = self.cswap(swap ^ bit, R0, R1)
+            swap = bit
+            R1 = self.ladder_add(R0, R1, P[0])
+            R0 = self.ladder_double(R0)
+        R0, R1 = self.cswap(swap, R0, R1)
+        if R0[1] == 0:
+            return None
+        if R1[1] == 0:
+            return self.neg(P)
+        return self.ladder_recover(P, R0, R1)
+
+
+class FixedBaseTable:
+    """Precomputed multiples of one fixed point, e.g. the generator.
+
+    Row j holds d * 2^(window*j) * base for d = 1 .. 2^window - 1 in affine
+    coordinates, so k * base is one table lookup and one mixed addition per
+    window of k and no doubling at all. The table is built on first use and
+    stored in a binary file (magic, window, base x, then x||y of every
+    point as 32 byte big endian), later instances just load that file.
+    """
+
+    MAGIC = b"FBT1"
+
+    def __init__(self, curve: CurveFp, base, order: int, window: int = 5, path: str | None = None) -> None:
+        self.curve = curve
+        self.base = base
+        self.order = order
+        self.window = window
+        self.windows = -(-order.bit_length() // window)
+        self.path = path
+        self._rows: list[list[tuple[int, int]]] | None = None
+
+    def mul(self, k: int) -> tuple[int, int] | None:
+        return self.curve.to_affine(self.mul_jacobian(k))
+
+    def mul_many(self, scalars: list[int]) -> list[tuple[int, int] | None]:
+        """k*base for every scalar, normalized together with one inversion."""
+        return self.curve.normalize_many([self.mul_jacobian(k) for k in scalars])
+
+    def mul_jacobian(self, k: int) -> tuple[int, int, int] | None:
+        k %= self.order
+        rows = self.rows
+        mask = (1 << self.window) - 1
+        result = None
+        for j in range(self.windows):
+            d = (k >> (self.window * j)) & mask
+            if d:
+                result = self.curve.jacobian_add_mixed(result, rows[j][d - 1])
+        return result
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory the built rows take as Python objects (lists, tuples and ints)."""
+        rows = self.rows
+        size = sys.getsizeof(rows)
+        for row in rows:
+            size += sys.getsizeof(row)
+            for point in row:
+                size += sys.getsizeof(point) + sys.getsizeof(point[0]) + sys.getsizeof(point[1])
+        return size
+
+    @property
+    def rows(self) -> list[list[tuple[int, int]]]:
+        if self._rows is None:
+            self._rows = self.load() if self.path and os.path.exists(self.path) else None
+            if self._rows is None:
+                self._rows = self.build()
+                if self.path:
+                    try:
+                        self.save()
+                    except OSError:
+                        pass  # read-only or missing directory, keep the table in memory only
+        return self._rows
+
+    def build(self) -> list[list[tuple[int, int]]]:
+        rows = []
+        row_base = self.curve.to_jacobian(self.base)
+        for _ in range(self.windows):
+            multiples = [row_base]
+            for _ in range((1 << self.window) - 2):
+                multiples.append(self.curve.jacobian_add(multiples[-1], row_base))
+            rows.append(self.curve.normalize_many(multiples))
+            for _ in range(self.window):
+                row_base = self.curve.jacobian_double(row_base)
+        return rows
+
+    def save(self) -> None:
+        data = bytearray(self.MAGIC)
+        data.append(self.window)
+        data.extend(self.base[0].to_bytes(32, "big"))
+        for row in self.rows:
+            for x, y in row:
+                data.extend(x.to_bytes(32, "big"))
+                data.extend(y.to_bytes(32, "big"))
+        # write and rename, so a concurrent reader never sees half a table
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self) -> list[list[tuple[int, int]]] | None:
+        """Rows from self.path, None if the file can't be read, is corrupted or belongs to another base or window.
+
+        Every point is checked with is_on_curve() and the first one has to
+        be the base, so a damaged file is rebuilt instead of silently
+        giving wrong products.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        per_row = (1 << self.window) - 1
+        header = len(self.MAGIC) + 1 + 32
+        if (len(data) < header
+                or data[:len(self.MAGIC)] != self.MAGIC
+                or data[len(self.MAGIC)] != self.window
+                or int.from_bytes(data[len(self.MAGIC) + 1:header], "big") != self.base[0]
+                or len(data) != header + self.windows * per_row * 64):
+            return None
+        view = memoryview(data)[header:]
+        points = [(int.from_bytes(view[i:i + 32], "big"), int.from_bytes(view[i + 32:i + 64], "big"))
+                  for i in range(0, len(view), 64)]
+        if points[0] != tuple(self.base) or not all(self.curve.is_on_curve(P) for P in points):
+            return None
+        return [points[j * per_row:(j + 1) * per_row] for j in range(self.windows)]
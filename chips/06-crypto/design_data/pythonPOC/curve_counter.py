@@ -0,0 +1,220 @@
+import argparse
+import random
+from contextlib import contextmanager
+from typing import Iterator
+
+from curve import CurveFp
+from ecdsa import Ecdsa
+
+# field operations of one call of every formula in CurveFp (a = 0 curve):
+# multiplications, squarings and additions/subtractions (incl. small constants).
+# Inversions are counted by inv_mod_binary itself, with its loop iterations.
+# Exceptional cases (P == Q inside an add, infinity results) are counted
+# like the general formula, early returns for infinity inputs cost nothing.
+FORMULA_COSTS = {
+    "affine_add": {"mul": 2, "sqr": 1, "add": 6},
+    "affine_double": {"mul": 2, "sqr": 2, "add": 8},
+    "jacobian_double": {"mul": 3, "sqr": 4, "add": 12},
+    "jacobian_add_mixed": {"mul": 8, "sqr": 3, "add": 7},
+    "jacobian_add": {"mul": 12, "sqr": 4, "add": 7},
+    "to_affine": {"mul": 3, "sqr": 1},
+    "endomorphism": {"mul": 1},
+    "ladder_double": {"mul": 4, "sqr": 3, "add": 5},
+    "ladder_add": {"mul": 6, "sqr": 2, "add": 4},
+    "ladder_recover": {"mul": 12, "sqr": 1, "add": 7},
+}
+
+
+class CountingCurveFp(CurveFp):
+    """CurveFp that counts the field operations behind every point operation.
+
+    The counting lives only in this subclass, so CurveFp itself stays
+    untouched and costs nothing extra. Swap it in where the numbers are
+    needed, e.g. Ecdsa(ec_curve=CountingCurveFp()).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: dict[str, int] = {}
+        self.reset_counts()
+
+    def reset_counts(self) -> None:
+        self.counts = {"mul": 0, "sqr": 0, "add": 0, "inv": 0, "inv_iterations": 0}
+        for formula in FORMULA_COSTS:
+            self.counts[formula] = 0
+
+    @contextmanager
+    def measure(self) -> Iterator[dict[str, int]]:
+        """Counts of everything that runs inside the with block."""
+        before = dict(self.counts)
+        delta: dict[str, int] = {}
+        yield delta
+        delta.update({name: self.counts[name] - before[name] for name in self.counts})
+
+    def _count(self, formula: str) -> None:
+        self.counts[formula] += 1
+        for op, amount in FORMULA_COSTS[formula].items():
+            self.counts[op] += amount
+
+    def inv_mod_binary(self, a, p) -> int:
+        # same algorithm as CurveFp.inv_mod_binary, with every loop step counted
+        a %= p
+        if a == 0:
+            raise ZeroDivisionError
+        iterations = 0
+        u, v = a, p
+        x1, x2 = 1, 0
+        while u != 1 and v != 1:
+            while (u & 1) == 0:
+                iterations += 1
+                u >>= 1
+                x1 = x1 >> 1 if (x1 & 1) == 0 else (x1 + p) >> 1
+            while (v & 1) == 0:
+                iterations += 1
+                v >>= 1
+                x2 = x2 >> 1 if (x2 & 1) == 0 else (x2 + p) >> 1
+            iterations += 1
+            if u >= v:
+                u -= v
+                x1 = (x1 - x2) % p
+            else:
+                v -= u
+                x2 = (x2 - x1) % p
+        self.counts["inv"] += 1
+        self.counts["inv_iterations"] += iterations
+        return x1 % p if u == 1 else x2 % p
+
+    def inv_mod_fermat(self, a, p) -> int:
+        # no loop to count, the exponentiation is a fixed chain of squarings and multiplications
+        e = p - 2
+        self.counts["inv"] += 1
+        self.counts["sqr"] += e.bit_length() - 1
+        self.counts["mul"] += bin(e).count("1") - 1
+        return super().inv_mod_fermat(a, p)
+
+    def add(self, P, Q) -> tuple[int, int] | None:
+        if P is not None and Q is not None and not (P[0] == Q[0] and (P[1] + Q[1]) % self.p == 0):
+            self._count("affine_double" if P == Q else "affine_add")
+        return super().add(P, Q)
+
+    def jacobian_double(self, P) -> tuple[int, int, int] | None:
+        if P is not None:
+            self._count("jacobian_double")
+        return super().jacobian_double(P)
+
+    def jacobian_add_mixed(self, P, Q) -> tuple[int, int, int] | None:
+        if P is not None and Q is not None:
+            self._count("jacobian_add_mixed")
+        return super().jacobian_add_mixed(P, Q)
+
+    def jacobian_add(self, P, Q) -> tuple[int, int, int] | None:
+        if P is not None and Q is not None:
+            self._count("jacobian_add")
+        return super().jacobian_add(P, Q)
+
+    def to_affine(self, P) -> tuple[int, int] | None:
+        if P is not None:
+            self._count("to_affine")
+        return super().to_affine(P)
+
+    def endomorphism(self, P) -> tuple[int, int] | None:
+        if P is not None:
+            self._count("endomorphism")
+        return super().endomorphism(P)
+
+    def ladder_double(self, P: tuple[int, int]) -> tuple[int, int]:
+        self._count("ladder_double")
+        return super().ladder_double(P)
+
+    def ladder_add(self, P: tuple[int, int], Q: tuple[int, int], x_diff: int) -> tuple[int, int]:
+        self._count("ladder_add")
+        return super().ladder_add(P, Q, x_diff)
+
+    def ladder_recover(self, P: tuple[int, int], R0: tuple[int, int], R1: tuple[int, int]) -> tuple[int, int]:
+        self._count("ladder_recover")
+        return super().ladder_recover(P, R0, R1)
+
+    def inv_many(self, values: list[int], p: int) -> list[int]:
+        # one inversion (counted by inv_mod_binary) plus 3(n-1) multiplications
+        if values:
+            self.counts["mul"] += 3 * (len(values) - 1)
+        return super().inv_many(values, p)
+
+    def normalize_many(self, points: list) -> list[tuple[int, int] | None]:
+        finite = sum(1 for P in points if P is not None)
+        self.counts["mul"] += 3 * finite
+        self.counts["sqr"] += finite
+        return super().normalize_many(points)
+
+
+class CostModel:
+    """Cycles per field operation of an assumed ECC datapath, override as needed.
+
+    The defaults describe a 256 bit unit built around a 32x32 bit
+    multiplier: 64 cycles for a product of 8 x 8 limbs incl. reduction,
+    8 cycles for a limb serial add/sub and one cycle per binary GCD step
+    (inversions are counted by their loop iterations, not as a whole).
+    """
+
+    def __init__(self, mul: int = 64, sqr: int = 64, add: int = 8, inv_iteration: int = 1) -> None:
+        self.mul = mul
+        self.sqr = sqr
+        self.add = add
+        self.inv_iteration = inv_iteration
+
+    def cycles(self, counts: dict[str, int]) -> int:
+        return (counts["mul"] * self.mul
+                + counts["sqr"] * self.sqr
+                + counts["add"] * self.add
+                + counts["inv_iterations"] * self.inv_iteration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='curve_counter',
+        description='Field operation counts and estimated ECC accelerator cycles of the pythonPOC curve'
+    )
+
+    parser.add_argument('--runs', type=int, default=10, help='random scalars/signatures to average over')
+    parser.add_argument('--mul-cycles', type=int, default=64)
+    parser.add_argument('--sqr-cycles', type=int, default=64)
+    parser.add_argument('--add-cycles', type=int, default=8)
+    parser.add_argument('--inv-iteration-cycles', type=int, default=1)
+    parser.add_argument('--sha-block-cycles', type=int, default=None,
+                        help='clk cycles per SHA256 block of the HASHER module, to express estimates in hash blocks')
+
+    args = parser.parse_args()
+
+    model = CostModel(args.mul_cycles, args.sqr_cycles, args.add_cycles, args.inv_iteration_cycles)
+    curve = CountingCurveFp()
+    ecdsa = Ecdsa(ec_curve=curve)
+    ecdsa.generator_table.rows  # load or build outside of the measurement
+    rng = random.Random(1337)
+
+    def report(name: str, totals: dict[str, int]) -> None:
+        avg = {op: totals[op] / args.runs for op in ("mul", "sqr", "add", "inv", "inv_iterations")}
+        cycles = model.cycles(totals) / args.runs
+        line = (f"{name:<16} {avg['mul']:>8.0f} M {avg['sqr']:>7.0f} S {avg['add']:>7.0f} A "
+                f"{avg['inv']:>4.1f} I ({avg['inv_iterations']:>5.0f} steps)  {cycles:>10.0f} cycles")
+        if args.sha_block_cycles:
+            line += f"  = {cycles / args.sha_block_cycles:.0f} SHA256 blocks"
+        print(line)
+
+    for method in ("affine", "jacobian", "wnaf", "glv", "ladder"):
+        totals = {}
+        with curve.measure() as totals:
+            for _ in range(args.runs):
+                curve.mul(rng.randrange(1, curve.n), ecdsa.generator, method=method)
+        report(f"mul {method}", totals)
+
+    privkey = rng.randrange(1, curve.n)
+    pubkey = curve.mul(privkey, ecdsa.generator, method="glv")
+    sigs = [(str(i), ecdsa.sign(str(i), privkey)) for i in range(args.runs)]
+    with curve.measure() as totals:
+        for _ in range(args.runs):
+            ecdsa.sign("msg", privkey)
+    report("sign", totals)
+    with curve.measure() as totals:
+        for msg, sig in sigs:
+            ecdsa.verify(msg, sig, pubkey)
+    report("verify", totals)
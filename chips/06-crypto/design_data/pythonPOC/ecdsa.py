@@ -1,10 +1,20 @@
 from random import randint
 import hashlib
-from curve import CurveFp
+import os
+import queue
+import secrets
+import threading
+from collections import OrderedDict
+from curve import CurveFp, FixedBaseTable
+
+# k*G table of the generator, built on the first signature and reused afterwards
+GENERATOR_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "secp256k1_generator.table")
+
+CHUNK_SIZE = 64 * 1024  # bytes read at a time from file-like messages
 
 
 class Ecdsa:
-    def __init__(self) -> None:
+    def __init__(self, ec_curve: CurveFp | None = None, hasher=hashlib.sha256) -> None:
 
         self.generator = (
             0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
@@ -13,14 +23,66 @@ class Ecdsa:
 
         self.order = 115792089237316195423570985008687907852837564279074904382605163141518161494337
 
-        self.ec_curve = CurveFp()
+        self.ec_curve = ec_curve or CurveFp()
+        self.generator_table = FixedBaseTable(
+            self.ec_curve, self.generator, self.order, path=GENERATOR_TABLE_PATH
+        )
+        self.nonce_pool = None  # optional NoncePool, used by sign() when no k is given
+        self.pubkey_cache = None  # optional PubkeyTableCache, used by verify()
+        # incremental hash with update() and digest(), e.g. hashlib.sha256 or sha256.SHA256
+        self.hasher = hasher
+
+    def hash_message(self, msg):
+        """H(m) as an integer.
+
+        msg is a str (hashed as UTF-8), a bytes-like object, a file-like
+        object with read() or an iterable of str/bytes chunks. Files and
+        iterables are fed to the hasher piece by piece, the message is never
+        held in memory as a whole.
+        """
+        h = self.hasher()
+        if isinstance(msg, str):
+            h.update(msg.encode())
+        elif isinstance(msg, (bytes, bytearray, memoryview)):
+            h.update(msg)
+        else:
+            for chunk in _read_chunks(msg) if hasattr(msg, "read") else msg:
+                h.update(chunk.encode() if isinstance(chunk, str) else chunk)
+        return int.from_bytes(h.digest(), "big")
+
+    @staticmethod
+    def digest_to_int(digest):
+        """A prehashed SHA256 digest as 32 bytes (big endian) or as int, e.g. the hash output of the chip.
 
-    def sign(self, msg, privkey, k=None):
+        Raises ValueError for anything else (other lengths, hex strings as
+        bytes, ints outside [0, 2^256)), those must not be signed silently.
+        """
+        if isinstance(digest, int):
+            if not 0 <= digest < 2**256:
+                raise ValueError("Digest has to be in [0, 2^256)")
+            return digest
+        if len(digest) != 32:
+            raise ValueError("Digest has to be 32 bytes")
+        return int.from_bytes(digest, "big")
+
+    def sign(self, msg, privkey, k=None, recoverable=False):
+        """(r, s) signature of msg, (r, s, v) with recoverable.
+
+        msg is anything hash_message() takes. The recovery id v holds the
+        parity of R.y in bit 0 and whether R.x was >= n in bit 1, it lets
+        verify_batch() restore R from r.
+        """
+        return self.sign_digest(self.hash_message(msg), privkey, k, recoverable)
+
+    def sign_digest(self, digest, privkey, k=None, recoverable=False):
+        """sign() of a message that is already hashed, see digest_to_int()."""
+        msg_hash = self.digest_to_int(digest)
+        if not k and self.nonce_pool is not None:
+            return self._sign_with_pool(msg_hash, privkey, recoverable)
         if not k:
             k = randint(1, 2**256)
-        msg_hash = int(hashlib.sha256(msg.encode()).hexdigest(), 16)
 
-        point = self.ec_curve.mul(k, self.generator)
+        point = self.generator_table.mul(k)
         if point is None:  # Punkt ist Point at Infinity
             raise ValueError("Random Number K is not suited for signing")
 
@@ -35,15 +97,57 @@ class Ecdsa:
         if s == 0:
             raise ValueError("Random Number K is not suited for signing")
 
+        if recoverable:
+            return r, s, self._recovery_id(point)
         return r, s
 
+    def _sign_with_pool(self, msg_hash, privkey, recoverable):
+        n = self.order
+        while True:
+            k, k_inv, r, v = self.nonce_pool.take()
+            s = (k_inv * (msg_hash + r * privkey)) % n
+            if s != 0:  # else just use the next nonce
+                return (r, s, v) if recoverable else (r, s)
+
+    def sign_many(self, msgs, privkey, ks=None, recoverable=False):
+        """sign() for a list of messages.
+
+        All R = k*G are normalized together and all k^{-1} mod n come from
+        one batch inversion, so the whole batch needs two inversions.
+        """
+        if ks is None:
+            ks = [randint(1, 2**256) for _ in msgs]
+        n = self.order
+        points = self.generator_table.mul_many(ks)
+        if any(point is None for point in points):
+            raise ValueError("Random Number K is not suited for signing")
+        k_invs = self.ec_curve.inv_many([k % n for k in ks], n)
+
+        sigs = []
+        for msg, point, k_inv in zip(msgs, points, k_invs, strict=True):
+            msg_hash = self.hash_message(msg)
+            r = point[0] % n
+            s = (k_inv * (msg_hash + r * privkey)) % n
+            if r == 0 or s == 0:
+                raise ValueError("Random Number K is not suited for signing")
+            sigs.append((r, s, self._recovery_id(point)) if recoverable else (r, s))
+        return sigs
+
+    def _recovery_id(self, point):
+        return (point[1] & 1) | (2 if point[0] >= self.order else 0)
+
     def verify(self, msg, sig, pubkey):
-        msg_hash = int(hashlib.sha256(msg.encode()).hexdigest(), 16)
+        """True if sig is a valid signature of msg (anything hash_message() takes) for pubkey."""
+        return self.verify_digest(self.hash_message(msg), sig, pubkey)
+
+    def verify_digest(self, digest, sig, pubkey):
+        """verify() of a message that is already hashed, see digest_to_int()."""
+        msg_hash = self.digest_to_int(digest)
         pub_point = pubkey
         n = self.order
         r, s = sig
         if not (
-            1 <= r <= n - 1 or 1 <= s <= n - 1
+            1 <= r <= n - 1 and 1 <= s <= n - 1
         ):  # r and s has to be in intervall [1, n-1]
             raise ValueError("Signature is not Element of [1; n-1]")
 
@@ -54,12 +158,236 @@ class Ecdsa:
         u2 = (r * self.ec_curve.inv_mod_binary(s, n)) % n  # u2 = r * s^{-1} mod n
 
         # Calculate P; Signature is invalid if P zero
-        P = self.ec_curve.add(
-            self.ec_curve.mul(u1, self.generator), self.ec_curve.mul(u2, pub_point)
-        )  # P = u1*G + u2*Q
+        if self.pubkey_cache is not None and pub_point is not None:
+            # P = u1*G + u2*Q from two fixed base tables, no doubling at all
+            P = self.ec_curve.to_affine(self.ec_curve.jacobian_add(
+                self.generator_table.mul_jacobian(u1),
+                self.pubkey_cache.get(tuple(pub_point)).mul_jacobian(u2),
+            ))
+        else:
+            # P = u1*G + u2*Q, both scalars GLV split so the four terms share
+            # one doubling chain of about 128 bits
+            u1_1, u1_2 = self.ec_curve.glv_split(u1)
+            u2_1, u2_2 = self.ec_curve.glv_split(u2)
+            P = self.ec_curve.mul_straus(
+                [u1_1, u1_2, u2_1, u2_2],
+                [
+                    self.generator,
+                    self.ec_curve.endomorphism(self.generator),
+                    pub_point,
+                    self.ec_curve.endomorphism(pub_point),
+                ],
+            )
         if P is None:
             return False
 
         return (
             r == P[0] % n
         )  # Signature is valid if x coordinate is congruent to r mod n
+
+    def verify_batch(self, msgs, sigs, pubkeys):
+        """verify() for many signatures, returns one bool per signature.
+
+        Recoverable (r, s, v) signatures are checked together: with R_i
+        restored from r_i and v_i, all equations u1_i*G + u2_i*Q_i = R_i are
+        weighted with random 128 bit numbers a_i and summed up,
+        sum(a_i*u1_i)*G + sum(a_i*u2_i*Q_i) - sum(a_i*R_i) = O, which is a
+        single multi-scalar multiplication. A failing batch is bisected
+        until the bad signatures are found, single ones are decided by
+        verify(). Plain (r, s) signatures always go through verify().
+        Every message is hashed exactly once, streams are fine.
+        """
+        n = self.order
+        results = [False] * len(sigs)
+        batch = []
+        for i, (msg, sig, pubkey) in enumerate(zip(msgs, sigs, pubkeys, strict=True)):
+            msg_hash = self.hash_message(msg)
+            r, s = sig[:2]
+            if not (1 <= r <= n - 1 and 1 <= s <= n - 1) or pubkey is None:
+                continue
+            pubkey = tuple(pubkey)  # also a dict key in _batch_equation_holds()
+            if len(sig) == 2:
+                results[i] = self.verify_digest(msg_hash, sig, pubkey)
+                continue
+            v = sig[2]
+            R = self.ec_curve.lift_x(r + n if v & 2 else r, v)
+            if R is None:
+                results[i] = self.verify_digest(msg_hash, (r, s), pubkey)
+                continue
+            batch.append((i, msg_hash, r, s, R, pubkey))
+
+        s_invs = self.ec_curve.inv_many([item[3] for item in batch], n)
+        terms = [(i, msg_hash, msg_hash * s_inv % n, r * s_inv % n, r, s, R, pubkey)
+                 for (i, msg_hash, r, s, R, pubkey), s_inv in zip(batch, s_invs)]
+        pending = [terms] if terms else []
+        while pending:
+            group = pending.pop()
+            if self._batch_equation_holds(group):
+                for item in group:
+                    results[item[0]] = True
+            elif len(group) == 1:
+                i, msg_hash, _, _, r, s, _, pubkey = group[0]
+                results[i] = self.verify_digest(msg_hash, (r, s), pubkey)  # e.g. a wrong recovery id
+            else:
+                pending += [group[:len(group) // 2], group[len(group) // 2:]]
+        return results
+
+    def _batch_equation_holds(self, terms):
+        n = self.order
+        curve = self.ec_curve
+        g_scalar = 0
+        pub_scalars = {}  # signatures of the same key share one term
+        scalars = []
+        points = []
+        for _, _, u1, u2, _, _, R, pubkey in terms:
+            a = secrets.randbits(128) | 1
+            g_scalar += a * u1
+            pub_scalars[pubkey] = pub_scalars.get(pubkey, 0) + a * u2
+            scalars.append(a)
+            points.append(curve.neg(R))
+        # GLV split the full length scalars, then every term has about 128 bits
+        for P, k in [(self.generator, g_scalar)] + list(pub_scalars.items()):
+            k1, k2 = curve.glv_split(k)
+            scalars += [k1, k2]
+            points += [P, curve.endomorphism(P)]
+        if len(points) < 64:
+            return curve.straus_jacobian(scalars, points) is None
+        return curve.pippenger_jacobian(scalars, points) is None
+
+
+def _read_chunks(stream):
+    while chunk := stream.read(CHUNK_SIZE):
+        yield chunk
+
+
+class NoncePool:
+    """Bounded queue of precomputed signing nonces (k, k^-1 mod n, r, recovery id).
+
+    A daemon worker thread refills the queue up to depth whenever it drops
+    to low_watermark, in batches that share one normalization and one
+    inversion (FixedBaseTable.mul_many(), CurveFp.inv_many()). Signing with
+    a pooled nonce is two multiplications mod n. If the pool runs dry,
+    take() computes a nonce inline and counts a miss.
+    """
+
+    def __init__(self, ecdsa: Ecdsa, depth: int = 1024, low_watermark: int = 256, batch: int = 64,
+                 start: bool = True) -> None:
+        if not 0 <= low_watermark < depth:
+            raise ValueError("low_watermark has to be in [0, depth)")
+        self.ecdsa = ecdsa
+        self.depth = depth
+        self.low_watermark = low_watermark
+        self.batch = batch
+        self.hits = 0
+        self.misses = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._refill = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        ecdsa.generator_table.rows  # load or build the table before the worker uses it
+        if start:
+            self.start()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, name="nonce-pool", daemon=True)
+        self._thread.start()
+        self._refill.set()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._refill.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def take(self) -> tuple[int, int, int, int]:
+        try:
+            nonce = self._queue.get_nowait()
+            self.hits += 1
+        except queue.Empty:
+            nonce = self.compute(1)[0]
+            self.misses += 1
+        if self._queue.qsize() <= self.low_watermark:
+            self._refill.set()
+        return nonce
+
+    def compute(self, count: int) -> list[tuple[int, int, int, int]]:
+        n = self.ecdsa.order
+        ks = [secrets.randbelow(n - 1) + 1 for _ in range(count)]
+        points = self.ecdsa.generator_table.mul_many(ks)
+        k_invs = self.ecdsa.ec_curve.inv_many(ks, n)
+        return [(k, k_inv, point[0] % n, self.ecdsa._recovery_id(point))
+                for k, k_inv, point in zip(ks, k_invs, points) if point[0] % n != 0]
+
+    def fill(self) -> None:
+        """Top the queue up to depth, in the calling thread."""
+        while not self._stop.is_set() and self._queue.qsize() < self.depth:
+            for nonce in self.compute(min(self.batch, self.depth - self._queue.qsize())):
+                try:
+                    self._queue.put_nowait(nonce)
+                except queue.Full:
+                    return
+
+    def _worker(self) -> None:
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            if self._stop.is_set():
+                return
+            self.fill()
+
+
+class PubkeyTableCache:
+    """LRU cache of FixedBaseTable's of public keys, for verify() against known signers.
+
+    A table is built on the first verification with a key and turns later
+    u2*Q into the same table walk as u1*G. Least recently used tables are
+    dropped once the tables together take more than max_bytes of memory
+    (FixedBaseTable.memory_bytes, about 300 KB for window 5).
+    """
+
+    def __init__(self, ecdsa: Ecdsa, max_bytes: int = 8 * 1024 * 1024, window: int = 5) -> None:
+        self.ecdsa = ecdsa
+        self.max_bytes = max_bytes
+        self.window = window
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tables: OrderedDict[tuple[int, int], FixedBaseTable] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, pubkey) -> bool:
+        return tuple(pubkey) in self._tables
+
+    def get(self, pubkey) -> FixedBaseTable:
+        pubkey = tuple(pubkey)
+        with self._lock:
+            table = self._tables.get(pubkey)
+            if table is not None:
+                self._tables.move_to_end(pubkey)
+                self.hits += 1
+                return table
+            self.misses += 1
+        table = FixedBaseTable(self.ecdsa.ec_curve, pubkey, self.ecdsa.order, window=self.window)
+        table.rows  # build outside of the lock
+        with self._lock:
+            if pubkey not in self._tables:
+                self._tables[pubkey] = table
+                self.nbytes += table.memory_bytes
+            while self.nbytes > self.max_bytes and len(self._tables) > 1:
+                _, evicted = self._tables.popitem(last=False)
+                self.nbytes -= evicted.memory_bytes
+                self.evictions += 1
+        return table
+
+    def stats(self) -> dict[str, int]:
+        return {"tables": len(self._tables), "bytes": self.nbytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,81 @@
+class Secp256k1Field:
+    """Arithmetic mod p = 2^256 - 2^32 - 977 with the special form reduction.
+
+    Since 2^256 = 2^32 + 977 (mod p) the upper half of a product can be
+    folded onto the lower half with shifts and adds only:
+
+        x = hi * 2^256 + lo  =  lo + (hi << 32) + hi * 977   (mod p)
+        hi * 977 = (hi << 10) - (hi << 6) + (hi << 4) + hi
+
+    Two folds bring any x < 2^512 below 2^257, one conditional subtraction
+    finishes the reduction. reduce_steps() is the bit accurate model of that
+    datapath, every intermediate value and its width can be compared
+    against a reduction unit. In Python the generic % p runs in C and is
+    faster, this layer is about matching the hardware, see benchmark.py.
+    """
+
+    p = 2**256 - 2**32 - 977
+    C = 2**32 + 977  # 2^256 mod p
+    MASK = 2**256 - 1
+
+    # widest value every register of the datapath has to hold
+    WIDTHS = {
+        "x": 512,
+        "fold1": 290,  # lo + hi * C with hi < 2^256
+        "hi2": 34,
+        "fold2": 257,  # lo + hi2 * C with hi2 < 2^34
+        "result": 256,
+    }
+
+    @staticmethod
+    def _times_977(x: int) -> int:
+        # 977 = 2^10 - 2^6 + 2^4 + 1, no multiplier needed
+        return (x << 10) - (x << 6) + (x << 4) + x
+
+    def _fold(self, x: int) -> tuple[int, int]:
+        hi = x >> 256
+        return (x & self.MASK) + (hi << 32) + self._times_977(hi), hi
+
+    def reduce(self, x: int) -> int:
+        """x mod p for 0 <= x < 2^512, e.g. the product of two field elements."""
+        x, _ = self._fold(x)
+        x, _ = self._fold(x)
+        return x - self.p if x >= self.p else x
+
+    def reduce_steps(self, x: int) -> dict[str, int]:
+        """Every intermediate value of reduce(), checked against WIDTHS.
+
+        Raises ValueError if a value does not fit its register (also with python -O).
+        """
+        if not 0 <= x < 2**512:
+            raise ValueError("Reduction input has to be in [0, 2^512)")
+        fold1, hi1 = self._fold(x)
+        fold2, hi2 = self._fold(fold1)
+        subtract = fold2 >= self.p
+        steps = {
+            "x": x,
+            "hi1": hi1,
+            "fold1": fold1,
+            "hi2": hi2,
+            "fold2": fold2,
+            "subtract": int(subtract),
+            "result": fold2 - self.p if subtract else fold2,
+        }
+        for name, width in self.WIDTHS.items():
+            if steps[name].bit_length() > width:
+                raise ValueError(f"{name} needs more than {width} bits")
+        return steps
+
+    def add(self, a: int, b: int) -> int:
+        s = a + b
+        return s - self.p if s >= self.p else s
+
+    def sub(self, a: int, b: int) -> int:
+        d = a - b
+        return d + self.p if d < 0 else d
+
+    def mul(self, a: int, b: int) -> int:
+        return self.reduce(a * b)
+
+    def sqr(self, a: int) -> int:
+        return self.reduce(a * a)
@@ -0,0 +1,131 @@
+import numpy as np
+
+from field import Secp256k1Field
+
+LIMBS = 10
+LIMB_BITS = 26
+LIMB_MASK = (1 << LIMB_BITS) - 1
+
+
+class LimbField:
+    """secp256k1 field elements as 10 x 26 bit limbs, many elements per call.
+
+    Arrays have shape (n, 10) with dtype uint64, limb i has weight 2^(26*i).
+    A product first accumulates the 19 partial product columns like a limb
+    serial multiplier would (every column < 10 * 2^52 < 2^56), then carries
+    them into 26 bit limbs and folds limbs 10..19 back with
+    2^260 = 16 * (2^32 + 977) = 2^26 * 2^10 + 15632 (mod p). Results are
+    kept below 2^260 with every limb < 2^26, normalize() brings them to
+    [0, p). mul_steps() exposes the intermediate arrays for the hardware
+    model, see Secp256k1Field for the reduction of the full width product.
+    """
+
+    p = Secp256k1Field.p
+    FOLD_LOW = 16 * 977  # 2^260 mod p, part that stays in the same limb
+    FOLD_HIGH = 1 << 10  # part that moves one limb up (2^36 = 2^26 * 2^10)
+
+    def __init__(self) -> None:
+        self.p_limbs = self.to_limbs([self.p])[0]
+        # a multiple of p with every limb >= 2^26, added before subtracting
+        # so no limb ever goes negative
+        self.sub_bias = self.p_limbs * 32
+
+    @staticmethod
+    def to_limbs(values: list[int]) -> np.ndarray:
+        limbs = np.empty((len(values), LIMBS), dtype=np.uint64)
+        for i, value in enumerate(values):
+            for j in range(LIMBS):
+                limbs[i, j] = (value >> (LIMB_BITS * j)) & LIMB_MASK
+        return limbs
+
+    @staticmethod
+    def from_limbs(limbs: np.ndarray) -> list[int]:
+        """Integers of the limbs as they are, without reducing mod p."""
+        return [sum(int(limb) << (LIMB_BITS * j) for j, limb in enumerate(row)) for row in limbs]
+
+    def _fold_top(self, limbs: np.ndarray, top: np.ndarray) -> None:
+        limbs[:, 0] += top * self.FOLD_LOW
+        limbs[:, 1] += top * self.FOLD_HIGH
+
+    def carry(self, limbs: np.ndarray) -> np.ndarray:
+        """Propagate carries until every limb is < 2^26, overflow of limb 9 is folded back."""
+        limbs = limbs.copy()
+        while True:
+            for i in range(LIMBS - 1):
+                limbs[:, i + 1] += limbs[:, i] >> LIMB_BITS
+                limbs[:, i] &= LIMB_MASK
+            top = limbs[:, -1] >> LIMB_BITS
+            limbs[:, -1] &= LIMB_MASK
+            if not top.any():
+                return limbs
+            self._fold_top(limbs, top)
+
+    def mul_steps(self, a: np.ndarray, b: np.ndarray) -> dict[str, np.ndarray]:
+        """Every stage of mul(): columns, carried 20 limb product, folded and result."""
+        columns = np.zeros((a.shape[0], 2 * LIMBS - 1), dtype=np.uint64)
+        for i in range(LIMBS):
+            columns[:, i:i + LIMBS] += a[:, i:i + 1] * b
+
+        product = np.zeros((a.shape[0], 2 * LIMBS), dtype=np.uint64)
+        carry = np.zeros(a.shape[0], dtype=np.uint64)
+        for i in range(2 * LIMBS - 1):
+            column = columns[:, i] + carry
+            product[:, i] = column & LIMB_MASK
+            carry = column >> LIMB_BITS
+        product[:, -1] = carry
+
+        # limb 10 + j has weight 2^260 * 2^(26*j)
+        folded = product[:, :LIMBS].copy()
+        high = product[:, LIMBS:]
+        folded += high * self.FOLD_LOW
+        folded[:, 1:] += high[:, :-1] * self.FOLD_HIGH
+        top = high[:, -1] * self.FOLD_HIGH  # limb 19 moved up lands on weight 2^260 again
+        self._fold_top(folded, top)
+        return {"columns": columns, "product": product, "folded": folded, "result": self.carry(folded)}
+
+    def mul(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return self.mul_steps(a, b)["result"]
+
+    def sqr(self, a: np.ndarray) -> np.ndarray:
+        return self.mul(a, a)
+
+    def add(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return self.carry(a + b)
+
+    def sub(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return self.carry(a + self.sub_bias - b)
+
+    def mul_small(self, a: np.ndarray, k: int) -> np.ndarray:
+        """a * k for a small constant k, as used by the curve formulas (2, 3, 4, 8)."""
+        return self.carry(a * np.uint64(k))
+
+    def normalize(self, a: np.ndarray) -> np.ndarray:
+        """Fully reduced limbs in [0, p)."""
+        a = self.carry(a)
+        # value < 2^260: fold the bits above 2^256 once more, 2^256 = 2^32 + 977 (mod p)
+        top = a[:, -1] >> 22
+        a[:, -1] &= (1 << 22) - 1
+        a[:, 0] += top * 977
+        a[:, 1] += top << 6  # 2^32 = 2^26 * 2^6
+        a = self.carry(a)
+        # now < 2^256 + small, subtract p where it is still >= p
+        diff = a.astype(np.int64) - self.p_limbs.astype(np.int64)
+        for i in range(LIMBS - 1):
+            borrow = diff[:, i] >> LIMB_BITS  # -1 or 0
+            diff[:, i] &= LIMB_MASK
+            diff[:, i + 1] += borrow
+        keep = diff[:, -1] < 0
+        return np.where(keep[:, None], a, diff.astype(np.uint64))
+
+    def jacobian_double_many(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray
+                             ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CurveFp.jacobian_double() (a = 0) for many points at once, none may be infinity."""
+        XX = self.sqr(X)
+        YY = self.sqr(Y)
+        YYYY = self.sqr(YY)
+        S = self.mul_small(self.mul(X, YY), 4)
+        M = self.mul_small(XX, 3)
+        X3 = self.sub(self.sqr(M), self.mul_small(S, 2))
+        Y3 = self.sub(self.mul(M, self.sub(S, X3)), self.mul_small(YYYY, 8))
+        Z3 = self.mul_small(self.mul(Y, Z), 2)
+        return X3, Y3, Z3
@@ -0,0 +1,64 @@
+import argparse
+import hashlib
+import mmap
+import os
+import time
+
+from sha256 import SHA256
+
+
+def hash_file(path: str) -> tuple[bytes, int, float]:
+    """SHA256 of a file with the reference model, returns (digest, size in bytes, seconds).
+
+    The file is memory mapped and walked with memoryview slices, so no block
+    of the file is copied on the way into the compression function.
+    """
+    sha256 = SHA256()
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:  # an empty file can not be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    sha256.update(view)
+                finally:
+                    view.release()
+    digest = sha256.digest()
+    return digest, size, time.perf_counter() - start
+
+
+def throughput(size: int, seconds: float) -> float:
+    """MB/s, 0 if the measurement was too short to mean anything."""
+    return size / seconds / 1e6 if seconds > 0 else 0.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='hash_file',
+        description='Hash files with the pythonPOC SHA256 reference model (output like sha256sum)'
+    )
+
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--verify', action='store_true', help='compare every digest against hashlib')
+
+    args = parser.parse_args()
+
+    total_size = 0
+    total_seconds = 0.0
+    mismatches = 0
+    for path in args.files:
+        digest, size, seconds = hash_file(path)
+        total_size += size
+        total_seconds += seconds
+        line = f"{digest.hex()}  {path}  ({size} bytes, {throughput(size, seconds):.2f} MB/s)"
+        if args.verify:
+            with open(path, 'rb') as f:
+                matches = hashlib.file_digest(f, 'sha256').digest() == digest
+            mismatches += not matches
+            line += "  OK" if matches else "  MISMATCH"
+        print(line)
+
+    if len(args.files) > 1:
+        print(f"[Done] {len(args.files)} files, {total_size} bytes, {throughput(total_size, total_seconds):.2f} MB/s")
+    raise SystemExit(1 if mismatches else 0)
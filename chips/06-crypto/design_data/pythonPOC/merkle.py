@@ -0,0 +1,107 @@
+import argparse
+import random
+import time
+from typing import Callable
+
+from sha256 import SHA256
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def hash_many(msgs: list[bytes]) -> list[bytes]:
+    """Sequential default backend, one reference SHA256 per message."""
+    digests = []
+    for msg in msgs:
+        sha256 = SHA256()
+        sha256.update(msg)
+        digests.append(sha256.digest())
+    return digests
+
+
+class MerkleTree:
+    """Binary SHA256 Merkle tree built level by level.
+
+    Leaves are H(0x00 || data) and inner nodes H(0x01 || left || right)
+    (RFC 6962 style domain separation). A node without a sibling is carried
+    up unchanged instead of being paired with itself. Every level is one
+    call of the hasher backend, so each level can be hashed in parallel:
+    pass ParallelHasher().hash or SHA256Batch().digest as hasher. A tree of n
+    leaves needs n leaf hashes plus n - 1 node hashes, update() only
+    rehashes the path of one leaf. That path is sequential, one message per
+    step, so update() always uses hash_many() instead of the backend.
+    """
+
+    def __init__(self, leaves: list[bytes], hasher: Callable[[list[bytes]], list[bytes]] = hash_many) -> None:
+        if not leaves:
+            raise ValueError("Merkle tree needs at least one leaf")
+        self.hasher = hasher
+        self.hash_count = 0
+        self.levels: list[list[bytes]] = [self._hash([LEAF_PREFIX + leaf for leaf in leaves])]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = self._hash([NODE_PREFIX + level[i] + level[i + 1] for i in range(0, len(level) - 1, 2)])
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def update(self, index: int, leaf: bytes) -> bytes:
+        """Replace one leaf and rehash only its path to the root, returns the new root."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Leaf index {index} out of range for {len(self)} leaves")
+        node = self._hash([LEAF_PREFIX + leaf], hash_many)[0]
+        for level in self.levels[:-1]:
+            level[index] = node
+            sibling = index ^ 1
+            if sibling < len(level):
+                left, right = (level[index], level[sibling]) if index % 2 == 0 else (level[sibling], level[index])
+                node = self._hash([NODE_PREFIX + left + right], hash_many)[0]
+            index //= 2
+        self.levels[-1][0] = node
+        return node
+
+    def _hash(self, msgs: list[bytes], hasher: Callable[[list[bytes]], list[bytes]] | None = None) -> list[bytes]:
+        self.hash_count += len(msgs)
+        return (hasher or self.hasher)(msgs)
+
+
+if __name__ == "__main__":
+    from sha256_batch import SHA256Batch
+    from sha256_parallel import ParallelHasher
+
+    parser = argparse.ArgumentParser(
+        prog='merkle',
+        description='Merkle root throughput of the SHA256 reference model for growing trees'
+    )
+
+    parser.add_argument('--leaves', type=int, nargs='+', default=[256, 1024, 4096], help='tree sizes')
+    parser.add_argument('--leaf-size', type=int, default=64, help='bytes per leaf')
+    parser.add_argument('--workers', type=int, default=None, help='processes of the parallel backend')
+
+    args = parser.parse_args()
+
+    parallel = ParallelHasher(workers=args.workers)
+    backends = {
+        'sequential': hash_many,
+        'parallel': parallel.hash,
+        'batch': SHA256Batch().digest,
+    }
+    for count in args.leaves:
+        leaves = [random.randbytes(args.leaf_size) for _ in range(count)]
+        for name, backend in backends.items():
+            start = time.perf_counter()
+            tree = MerkleTree(leaves, hasher=backend)
+            seconds = time.perf_counter() - start
+            print(f"{count:>8} leaves  {name:<10}  {tree.hash_count / seconds:>10.0f} hashes/s  root {tree.root.hex()[:16]}")
+        start = time.perf_counter()
+        before = tree.hash_count
+        tree.update(count // 2, b'changed')
+        print(f"{count:>8} leaves  update      {tree.hash_count - before} sequential hashes in {(time.perf_counter() - start) * 1e3:.2f} ms")
+    parallel.close()
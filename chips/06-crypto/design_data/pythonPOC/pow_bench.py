@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import random
+import time
+
+import numpy as np
+
+from sha256 import SHA256
+from sha256_batch import SHA256Batch
+
+HEADER_SIZE = 80  # bytes, the nonce is stored in the last 4 of them (little endian)
+
+
+def _midstate_sha256(header: bytes) -> SHA256:
+    # the first 64 bytes do not depend on the nonce, they are compressed once
+    sha256 = SHA256()
+    sha256.update(header[:64])
+    return sha256
+
+
+def double_sha256_python(header: bytes, nonces: range) -> list[bytes]:
+    """sha256(sha256(header)) for every nonce with the pure Python reference model."""
+    midstate = _midstate_sha256(header)
+    tail = header[64:76]
+    digests = []
+    for nonce in nonces:
+        first = midstate.copy()
+        first.update(tail + nonce.to_bytes(4, byteorder='little'))
+        second = SHA256()
+        second.update(first.digest())
+        digests.append(second.digest())
+    return digests
+
+
+def double_sha256_batch(header: bytes, nonces: range, batch: SHA256Batch | None = None) -> list[bytes]:
+    """Same as double_sha256_python, with the two remaining blocks compressed in numpy lanes.
+
+    The nonces are processed batch.batch_size at a time, which bounds the
+    memory of the message schedule.
+    """
+    batch = batch or SHA256Batch()
+    midstate = np.array(_midstate_sha256(header).export_midstate()[0], dtype=np.uint32)
+    tail = np.frombuffer(header[64:76], dtype='>u4')
+    digests = []
+    for start in range(0, len(nonces), batch.batch_size):
+        chunk = nonces[start:start + batch.batch_size]
+        lanes = len(chunk)
+
+        # second block of the header: 12 bytes of tail, the nonce and the padding of an 80 byte message
+        blocks = np.zeros((lanes, 16), dtype=np.uint32)
+        blocks[:, :3] = tail
+        blocks[:, 3] = np.arange(chunk.start, chunk.stop, chunk.step, dtype=np.uint32).byteswap()
+        blocks[:, 4] = 0x80000000
+        blocks[:, 15] = HEADER_SIZE * 8
+        first = batch.compress(np.broadcast_to(midstate, (lanes, 8)), blocks)
+
+        # the 32 byte digest padded to a single block
+        blocks = np.zeros((lanes, 16), dtype=np.uint32)
+        blocks[:, :8] = first
+        blocks[:, 8] = 0x80000000
+        blocks[:, 15] = 32 * 8
+        second = batch.compress(np.broadcast_to(batch.h_init, (lanes, 8)), blocks)
+
+        raw = second.astype('>u4').tobytes()
+        digests += [raw[i:i + 32] for i in range(0, len(raw), 32)]
+    return digests
+
+
+def double_sha256_hashlib(header: bytes, nonces: range) -> list[bytes]:
+    midstate = hashlib.sha256(header[:64])
+    tail = header[64:76]
+    digests = []
+    for nonce in nonces:
+        first = midstate.copy()
+        first.update(tail + nonce.to_bytes(4, byteorder='little'))
+        digests.append(hashlib.sha256(first.digest()).digest())
+    return digests
+
+
+def meets_target(digest: bytes, zero_bits: int) -> bool:
+    """Bitcoin style check, the digest is read as a little endian number."""
+    return int.from_bytes(digest, byteorder='little') >> (256 - zero_bits) == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='pow_bench',
+        description='Double SHA256 nonce sweep over an 80 byte header with midstate reuse'
+    )
+
+    parser.add_argument('--nonces', type=int, default=2000, help='nonces per backend')
+    parser.add_argument('--batch-nonces', type=int, default=100000, help='nonces for the numpy backend')
+    parser.add_argument('--zero-bits', type=int, default=8, help='leading zero bits a hit needs')
+    parser.add_argument('--chip-cycles', type=int, default=None,
+                        help='clk cycles per block as logged by ChipTester.receive_hash, for a chip estimate')
+    parser.add_argument('--chip-clock', type=float, default=5e3, help='chip clock in Hz (default 5kHz)')
+    parser.add_argument('--seed', type=int, default=1337)
+
+    args = parser.parse_args()
+
+    header = random.Random(args.seed).randbytes(HEADER_SIZE)
+    backends = [
+        ('python', double_sha256_python, args.nonces),
+        ('batch', double_sha256_batch, args.batch_nonces),
+        ('hashlib', double_sha256_hashlib, args.batch_nonces),
+    ]
+    results = {}
+    for name, backend, count in backends:
+        nonces = range(0, count)
+        start = time.perf_counter()
+        digests = backend(header, nonces)
+        seconds = time.perf_counter() - start
+        hits = sum(meets_target(digest, args.zero_bits) for digest in digests)
+        results[name] = digests
+        print(f"{name:<8} {count:>8} nonces  {count / seconds:>12.0f} hashes/s  {hits} hits")
+
+    shared = min(args.nonces, args.batch_nonces)
+    assert results['python'][:shared] == results['batch'][:shared] == results['hashlib'][:shared]
+
+    if args.chip_cycles:
+        # two compressions per nonce once the midstate is loaded
+        print(f"chip     {args.chip_clock / (2 * args.chip_cycles):>23.1f} hashes/s  "
+              f"({args.chip_cycles} cycles per block at {args.chip_clock:.0f} Hz)")
@@ -1,7 +1,69 @@
+import copy
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+K = (
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+)
+
+# set SHA256_UNROLLED=0 before the import to fall back to the loop based compression
+UNROLLED = os.environ.get('SHA256_UNROLLED', '1') != '0'
+
+
+def _generate_compress_source() -> str:
+    """Straight line source of one compression, every round and schedule word unrolled.
+
+    Rotates are inlined and only the results of additions get masked: the
+    high bits the left shifts leave behind never reach the low 32 bits of a
+    sum, so the intermediate S0/S1/temp1 values can stay unmasked.
+    """
+    def sigma(x: str, r1: int, r2: int, r3: int, shift: bool = False) -> str:
+        last = f'{x} >> {r3}' if shift else f'{x} >> {r3} | {x} << {32 - r3}'
+        return f'(({x} >> {r1} | {x} << {32 - r1}) ^ ({x} >> {r2} | {x} << {32 - r2}) ^ ({last}))'
+
+    lines = ['def _compress(state, chunk):',
+             '    ' + ', '.join(f'w{i}' for i in range(16)) + " = _unpack('>16I', chunk)"]
+    for i in range(16, 64):
+        lines.append(f'    w{i} = (w{i - 16} + {sigma(f"w{i - 15}", 7, 18, 3, True)} + '
+                     f'w{i - 7} + {sigma(f"w{i - 2}", 17, 19, 10, True)}) & 0xffffffff')
+    lines.append('    a, b, c, d, e, f, g, h = state')
+    v = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+    for i in range(64):
+        a, b, c, d, e, f, g, h = v
+        lines.append(f'    t = {h} + {sigma(e, 6, 11, 25)} + ({g} ^ ({e} & ({f} ^ {g}))) + {K[i]:#010x} + w{i}')
+        lines.append(f'    {d} = ({d} + t) & 0xffffffff')
+        lines.append(f'    {h} = (t + {sigma(a, 2, 13, 22)} + (({a} & {b}) | ({c} & ({a} | {b})))) & 0xffffffff')
+        v = [h, a, b, c, d, e, f, g]
+    lines.append('    return (' + ', '.join(f'(state[{i}] + {x}) & 0xffffffff' for i, x in enumerate(v)) + ')')
+    return '\n'.join(lines) + '\n'
+
+
+_namespace = {'_unpack': struct.unpack}
+exec(_generate_compress_source(), _namespace)
+_compress = _namespace['_compress']
+
+
 class SHA256:
     # all 32 bit unsigned ints
 
-    def __init__(self) -> None:
+    def __init__(self, trace: bool = False) -> None:
+        # with trace every compressed block is remembered, see get_trace()
+        self.trace = trace
+        if trace:
+            self._internal_hash_chunk = self._traced_hash_chunk
         self.reset()
 
     def reset(self) -> None:
@@ -13,17 +75,10 @@ class SHA256:
         self.h5 = 0x9b05688c
         self.h6 = 0x1f83d9ab
         self.h7 = 0x5be0cd19
-        self.k = [
-            0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
-            0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
-            0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
-            0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
-            0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
-            0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
-            0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
-            0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
-        ]
+        self.k = K
         self.length = 0  # 64bit
+        self._buffer = bytearray()  # carry of update(), always < 64 bytes
+        self._trace_blocks: list[tuple[tuple[int, ...], bytes]] = []
 
     def _get_hash(self):
         return ((self.h0 << (32 * 7)) +
@@ -48,21 +103,115 @@ class SHA256:
         self.length += len(chunk) * 8
         self.length %= (2 ** 64)
         if len(chunk_array) != 64:
-            chunk_array.append(0x80)  # 0b1000 0000
-            while (len(chunk_array) + 8) % 64 != 0:
-                chunk_array.append(0)
-            chunk_array.extend(self.length.to_bytes(8, byteorder='big'))
-            for i in range(0, len(chunk_array), 64):
-                self._internal_hash_chunk(bytes(chunk_array[i * 64:(i + 1) * 64]))
+            self._pad_and_hash(chunk_array)
         else:
             self._internal_hash_chunk(chunk)
         return self._get_hash()
 
+    def update(self, data: bytes) -> None:
+        """Feed message bytes in pieces of any size (hashlib style).
+
+        Only complete 64 byte blocks are compressed, the rest is kept in a
+        carry buffer until the next call, so memory stays constant no matter
+        how long the message is. Do not mix with hash()/hash_chunk() on the
+        same instance without a reset() in between.
+        """
+        view = memoryview(data).cast('B')
+        self.length += len(view) * 8
+        self.length %= (2 ** 64)
+        offset = 0
+        if self._buffer:
+            offset = min(64 - len(self._buffer), len(view))
+            self._buffer.extend(view[:offset])
+            if len(self._buffer) < 64:
+                return
+            self._internal_hash_chunk(self._buffer)
+            self._buffer.clear()
+        end = offset + (len(view) - offset) // 64 * 64
+        for i in range(offset, end, 64):
+            self._internal_hash_chunk(view[i:i + 64])
+        self._buffer.extend(view[end:])
+
+    def digest(self) -> bytes:
+        """Hash of all bytes passed to update() so far, the state is left untouched."""
+        final = self.copy()
+        final._pad_and_hash(final._buffer)
+        return final._get_hash().to_bytes(32, byteorder='big')
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self) -> 'SHA256':
+        """Independent clone, e.g. to hash several messages sharing a prefix."""
+        clone = copy.copy(self)
+        clone._buffer = bytearray(self._buffer)
+        clone._trace_blocks = list(self._trace_blocks)
+        if self.trace:
+            clone._internal_hash_chunk = clone._traced_hash_chunk
+        return clone
+
+    def export_midstate(self) -> tuple[tuple[int, ...], int]:
+        """Intermediate h0..h7 and the bit length processed so far.
+
+        A midstate only exists on a 64 byte block boundary, which is also the
+        only point where the hasher RTL could be seeded with it.
+        """
+        if self._buffer or self.length % 512 != 0:
+            raise ValueError("Midstate is only defined on a 512 bit block boundary")
+        return (self.h0, self.h1, self.h2, self.h3, self.h4, self.h5, self.h6, self.h7), self.length
+
+    def import_midstate(self, state: tuple[int, ...], length: int) -> None:
+        if len(state) != 8 or length % 512 != 0:
+            raise ValueError("Midstate needs 8 words and a length that is a multiple of 512 bits")
+        self.h0, self.h1, self.h2, self.h3, self.h4, self.h5, self.h6, self.h7 = state
+        self.length = length % (2 ** 64)
+        self._buffer = bytearray()
+
+    def _pad_and_hash(self, tail: bytearray) -> None:
+        # tail holds the last (< 64) message bytes, self.length must already include them
+        tail.append(0x80)  # 0b1000 0000
+        while (len(tail) + 8) % 64 != 0:
+            tail.append(0)
+        tail.extend(self.length.to_bytes(8, byteorder='big'))
+        for i in range(0, len(tail), 64):
+            self._internal_hash_chunk(tail[i:i + 64])
+
     @staticmethod
     def _right_rotate(value: int, amount: int) -> int:
         return (2 ** 32 - 1) & (value >> amount | value << (32 - amount))
 
-    def _internal_hash_chunk(self, chunk: bytes):
+    def get_trace(self) -> list['np.ndarray']:
+        """Per round state of every block compressed since the last reset().
+
+        One uint32 array of shape (64, 9) per block, row i holds a..h as
+        they enter round i (what the hasher RTL registers hold while
+        loops == i) followed by w[i]. Only the block inputs are stored while
+        hashing, the rounds are recomputed here on request. Blocks hashed by
+        digest() are not part of the trace, it works on a copy.
+        """
+        import numpy as np
+
+        traces = []
+        for state, chunk in self._trace_blocks:
+            w = self._message_schedule(chunk)
+            rounds = np.empty((64, 9), dtype=np.uint32)
+            for i in range(0, 64):
+                rounds[i] = (*state, w[i])
+                state = self._round(state, self.k[i], w[i])
+            traces.append(rounds)
+        return traces
+
+    def _traced_hash_chunk(self, chunk: bytes):
+        self._trace_blocks.append(((self.h0, self.h1, self.h2, self.h3,
+                                    self.h4, self.h5, self.h6, self.h7), bytes(chunk)))
+        type(self)._internal_hash_chunk(self, chunk)
+
+    def _unrolled_hash_chunk(self, chunk: bytes):
+        (self.h0, self.h1, self.h2, self.h3,
+         self.h4, self.h5, self.h6, self.h7) = _compress((self.h0, self.h1, self.h2, self.h3,
+                                                          self.h4, self.h5, self.h6, self.h7), chunk)
+
+    def _message_schedule(self, chunk: bytes) -> list[int]:
         w = [0] * 64
         for i in range(16):
             w[i] = int.from_bytes(chunk[i * 4:(i + 1) * 4], byteorder='big')
@@ -74,37 +223,30 @@ class SHA256:
                   self._right_rotate(w[i - 2], 19) ^
                   (w[i - 2] >> 10))
             w[i] = (w[i - 16] + s0 + w[i - 7] + s1) % (2 ** 32)
+        return w
+
+    def _round(self, state: tuple[int, ...], k: int, w: int) -> tuple[int, ...]:
+        """One compression round, a..h in and out, shared by the reference model and get_trace()."""
+        a, b, c, d, e, f, g, h = state
+        S1 = (self._right_rotate(e, 6) ^
+              self._right_rotate(e, 11) ^
+              self._right_rotate(e, 25))
+        ch = (e & f) ^ ((~e) & g)
+        temp1 = (h + S1 + ch + k + w) % (2 ** 32)
+        S0 = (self._right_rotate(a, 2) ^
+              self._right_rotate(a, 13) ^
+              self._right_rotate(a, 22))
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        temp2 = (S0 + maj) % (2 ** 32)
+        return (temp1 + temp2) % (2 ** 32), a, b, c, (d + temp1) % (2 ** 32), e, f, g
 
-        a = self.h0
-        b = self.h1
-        c = self.h2
-        d = self.h3
-        e = self.h4
-        f = self.h5
-        g = self.h6
-        h = self.h7
+    def _reference_hash_chunk(self, chunk: bytes):
+        w = self._message_schedule(chunk)
 
+        state = (self.h0, self.h1, self.h2, self.h3, self.h4, self.h5, self.h6, self.h7)
         for i in range(0, 64):
-            S1 = (self._right_rotate(e, 6) ^
-                  self._right_rotate(e, 11) ^
-                  self._right_rotate(e, 25))
-            ch = (e & f) ^ ((~e) & g)
-            temp1 = (h + S1 + ch + self.k[i] + w[i]) % (2 ** 32)
-            S0 = (self._right_rotate(a, 2) ^
-                  self._right_rotate(a, 13) ^
-                  self._right_rotate(a, 22))
-            maj = (a & b) ^ (a & c) ^ (b & c)
-            temp2 = (S0 + maj) % (2 ** 32)
-
-            h = g
-            g = f
-            f = e
-            e = (d + temp1) % (2 ** 32)
-            d = c
-            c = b
-            b = a
-            a = (temp1 + temp2) % (2 ** 32)
-            pass
+            state = self._round(state, self.k[i], w[i])
+        a, b, c, d, e, f, g, h = state
 
         self.h0 = (self.h0 + a) % (2 ** 32)
         self.h1 = (self.h1 + b) % (2 ** 32)
@@ -114,3 +256,47 @@ class SHA256:
         self.h5 = (self.h5 + f) % (2 ** 32)
         self.h6 = (self.h6 + g) % (2 ** 32)
         self.h7 = (self.h7 + h) % (2 ** 32)
+
+    _internal_hash_chunk = _unrolled_hash_chunk if UNROLLED else _reference_hash_chunk
+
+
+class MidstateCache:
+    """LRU cache of midstates for messages that share a prefix.
+
+    The block aligned part of a prefix is compressed once, later lookups of
+    the same prefix start from the cached midstate and only hash the rest.
+    Entries are keyed by the digest of the prefix, so the prefixes
+    themselves are not kept alive.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[tuple[int, ...], int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prefix: bytes) -> SHA256:
+        """Fresh SHA256 that already consumed prefix, ready for update()."""
+        aligned = len(prefix) // 64 * 64
+        key = hashlib.sha256(memoryview(prefix)[:aligned]).digest()
+        sha256 = SHA256()
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            sha256.import_midstate(*self._entries[key])
+        else:
+            self.misses += 1
+            sha256.update(memoryview(prefix)[:aligned])
+            self._entries[key] = sha256.export_midstate()
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        sha256.update(memoryview(prefix)[aligned:])
+        return sha256
+
+    def digest(self, prefix: bytes, suffix: bytes) -> bytes:
+        sha256 = self.get(prefix)
+        sha256.update(suffix)
+        return sha256.digest()
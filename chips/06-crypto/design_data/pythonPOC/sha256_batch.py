@@ -0,0 +1,89 @@
+import numpy as np
+
+from sha256 import K, SHA256
+
+
+class SHA256Batch:
+    """SHA256 over many independent messages at once.
+
+    Every message is one lane of a uint32 numpy array, the 64 rounds run
+    on whole columns, so the Python overhead is paid per round instead of
+    per message. Meant for generating golden vectors for the testbenches.
+    """
+
+    def __init__(self, batch_size: int = 1 << 16) -> None:
+        self.batch_size = batch_size  # max lanes per compression call, bounds memory
+        reference = SHA256()
+        self.k = np.array(K, dtype=np.uint32)
+        self.h_init = np.array([reference.h0, reference.h1, reference.h2, reference.h3,
+                                reference.h4, reference.h5, reference.h6, reference.h7], dtype=np.uint32)
+
+    @staticmethod
+    def _right_rotate(value: np.ndarray, amount: int) -> np.ndarray:
+        return (value >> amount) | (value << (32 - amount))
+
+    @staticmethod
+    def pad(msgs: list[bytes]) -> np.ndarray:
+        """Pad messages of equal length into blocks of shape (lanes, blocks, 16) uint32."""
+        length = len(msgs[0])
+        padded_length = (length + 8) // 64 * 64 + 64
+        data = np.zeros((len(msgs), padded_length), dtype=np.uint8)
+        if length:
+            data[:, :length] = np.frombuffer(b''.join(msgs), dtype=np.uint8).reshape(len(msgs), length)
+        data[:, length] = 0x80  # 0b1000 0000
+        data[:, -8:] = np.frombuffer(((length * 8) % (2 ** 64)).to_bytes(8, byteorder='big'), dtype=np.uint8)
+        return data.view('>u4').astype(np.uint32).reshape(len(msgs), padded_length // 64, 16)
+
+    def compress(self, state: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+        """One compression per lane, state is (lanes, 8) and blocks is (lanes, 16)."""
+        w = np.empty((64, blocks.shape[0]), dtype=np.uint32)
+        w[:16] = blocks.T
+        for i in range(16, 64):
+            s0 = self._right_rotate(w[i - 15], 7) ^ self._right_rotate(w[i - 15], 18) ^ (w[i - 15] >> 3)
+            s1 = self._right_rotate(w[i - 2], 17) ^ self._right_rotate(w[i - 2], 19) ^ (w[i - 2] >> 10)
+            w[i] = w[i - 16] + s0 + w[i - 7] + s1
+
+        a, b, c, d, e, f, g, h = state.T
+        for i in range(0, 64):
+            S1 = self._right_rotate(e, 6) ^ self._right_rotate(e, 11) ^ self._right_rotate(e, 25)
+            ch = (e & f) ^ (~e & g)
+            temp1 = h + S1 + ch + self.k[i] + w[i]
+            S0 = self._right_rotate(a, 2) ^ self._right_rotate(a, 13) ^ self._right_rotate(a, 22)
+            maj = (a & b) ^ (a & c) ^ (b & c)
+            temp2 = S0 + maj
+
+            h = g
+            g = f
+            f = e
+            e = d + temp1
+            d = c
+            c = b
+            b = a
+            a = temp1 + temp2
+
+        return state + np.stack([a, b, c, d, e, f, g, h], axis=1)
+
+    def hash_states(self, msgs: list[bytes]) -> np.ndarray:
+        """Final h0..h7 of every message as (lanes, 8) uint32, in input order."""
+        states = np.empty((len(msgs), 8), dtype=np.uint32)
+        by_length: dict[int, list[int]] = {}
+        for i, msg in enumerate(msgs):
+            by_length.setdefault(len(msg), []).append(i)
+        # messages of the same length share their block count, so no lane ever idles
+        for indices in by_length.values():
+            for start in range(0, len(indices), self.batch_size):
+                lanes = indices[start:start + self.batch_size]
+                blocks = self.pad([msgs[i] for i in lanes])
+                state = np.broadcast_to(self.h_init, (len(lanes), 8))
+                for j in range(blocks.shape[1]):
+                    state = self.compress(state, blocks[:, j])
+                states[lanes] = state
+        return states
+
+    def hash(self, msgs: list[bytes]) -> list[int]:
+        """Same result as SHA256().hash(msg) for every message."""
+        return [int.from_bytes(digest, byteorder='big') for digest in self.digest(msgs)]
+
+    def digest(self, msgs: list[bytes]) -> list[bytes]:
+        raw = self.hash_states(msgs).astype('>u4').tobytes()
+        return [raw[i:i + 32] for i in range(0, len(raw), 32)]
@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from sha256 import SHA256
+
+
+@dataclass
+class WorkerStats:
+    messages: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """MB/s of pure hashing time in this worker."""
+        return self.bytes / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+
+def _hash_task(start: int, msgs: list[bytes]) -> tuple[int, list[bytes], int, float]:
+    begin = time.perf_counter()
+    digests = []
+    for msg in msgs:
+        sha256 = SHA256()
+        sha256.update(msg)
+        digests.append(sha256.digest())
+    return start, digests, os.getpid(), time.perf_counter() - begin
+
+
+class ParallelHasher:
+    """Hash many independent messages with the reference model on a process pool.
+
+    Messages are sent to the workers in chunks to keep the pickling overhead
+    per task low, the digests come back in input order. worker_stats holds
+    what each worker process did during the last hash() call. The pool is
+    started on the first hash() and reused until close(), or use the
+    hasher as a context manager.
+    """
+
+    def __init__(self, workers: int | None = None, chunksize: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.worker_stats: dict[int, WorkerStats] = {}
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ParallelHasher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash(self, msgs: list[bytes]) -> list[bytes]:
+        self.worker_stats = {}
+        if not msgs:
+            return []
+        # a few tasks per worker, so a slow chunk does not leave the others idle at the end
+        chunksize = self.chunksize or -(-len(msgs) // (self.workers * 4))
+        digests: list[bytes] = [b''] * len(msgs)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self._pool.submit(_hash_task, start, msgs[start:start + chunksize])
+                   for start in range(0, len(msgs), chunksize)]
+        for future in futures:
+            start, chunk_digests, pid, seconds = future.result()
+            digests[start:start + len(chunk_digests)] = chunk_digests
+            stats = self.worker_stats.setdefault(pid, WorkerStats())
+            stats.messages += len(chunk_digests)
+            stats.bytes += sum(len(msg) for msg in msgs[start:start + len(chunk_digests)])
+            stats.seconds += seconds
+        return digests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='sha256_parallel',
+        description='Hash random messages with the reference model on a process pool, per worker throughput'
+    )
+
+    parser.add_argument('--messages', type=int, default=2000, help='number of messages')
+    parser.add_argument('--size', type=int, default=1024, help='bytes per message')
+    parser.add_argument('--workers', type=int, default=None, help='processes, default all CPUs')
+    parser.add_argument('--chunksize', type=int, default=None, help='messages per task')
+
+    args = parser.parse_args()
+
+    msgs = [random.randbytes(args.size) for _ in range(args.messages)]
+    with ParallelHasher(workers=args.workers, chunksize=args.chunksize) as hasher:
+        start = time.perf_counter()
+        hasher.hash(msgs)
+        seconds = time.perf_counter() - start
+
+    print(f"{len(msgs)} messages of {args.size} bytes on {hasher.workers} workers: "
+          f"{len(msgs) * args.size / seconds / 1e6:.2f} MB/s in {seconds:.2f} s")
+    for pid, stats in sorted(hasher.worker_stats.items()):
+        print(f"  pid {pid:>7}  {stats.messages:>7} messages  {stats.throughput:>7.2f} MB/s  {stats.seconds:>7.2f} s")
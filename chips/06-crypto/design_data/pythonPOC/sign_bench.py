@@ -0,0 +1,60 @@
+import argparse
+import random
+import statistics
+import time
+
+from ecdsa import Ecdsa, NoncePool
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def sign_latencies(ecdsa: Ecdsa, privkey: int, count: int, interval: float = 0.0) -> list[float]:
+    """Seconds per sign() call, with interval seconds of idle time between calls."""
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        ecdsa.sign(f"message {i}", privkey)
+        latencies.append(time.perf_counter() - start)
+        if interval:
+            time.sleep(interval)
+    return latencies
+
+
+def percentiles(values: list[float], points: tuple[float, ...] = PERCENTILES) -> dict[float, float]:
+    if not values:
+        raise ValueError("Percentiles need at least one value")
+    if len(values) == 1:  # statistics.quantiles() needs two
+        return {p: values[0] for p in points}
+    cuts = statistics.quantiles(values, n=1000, method="inclusive")
+    return {p: cuts[min(int(p * 10), 999) - 1] for p in points}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='sign_bench',
+        description='ECDSA sign() latency percentiles with and without a precomputed nonce pool'
+    )
+
+    parser.add_argument('--count', type=int, default=2000, help='signatures per run')
+    parser.add_argument('--depth', type=int, default=1024, help='nonce pool depth')
+    parser.add_argument('--low-watermark', type=int, default=256, help='pool refill threshold')
+    parser.add_argument('--interval', type=float, default=0.001,
+                        help='idle seconds between signatures, gives the worker time to refill')
+
+    args = parser.parse_args()
+
+    ecdsa = Ecdsa()
+    privkey = random.randrange(1, ecdsa.order)
+    ecdsa.generator_table.rows
+
+    runs = {"inline": sign_latencies(ecdsa, privkey, args.count, args.interval)}
+    pool = NoncePool(ecdsa, depth=args.depth, low_watermark=args.low_watermark)
+    pool.fill()
+    ecdsa.nonce_pool = pool
+    runs["pool"] = sign_latencies(ecdsa, privkey, args.count, args.interval)
+    pool.close()
+
+    print(f"{'':<8}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + "   (us)")
+    for name, latencies in runs.items():
+        print(f"{name:<8}" + "".join(f"{v * 1e6:>10.1f}" for v in percentiles(latencies).values()))
+    print(f"pool hits {pool.hits}, misses {pool.misses}")
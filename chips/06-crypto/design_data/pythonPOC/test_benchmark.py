@@ -0,0 +1,15 @@
+from benchmark import BENCHMARKS, find_regressions, measure
+
+
+def test_find_regressions():
+    baseline = {'a': 100.0, 'b': 100.0, 'c': 100.0}
+    current = {'a': 85.0, 'b': 70.0, 'd': 1.0}
+    regressions = find_regressions(current, baseline, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('b:')
+
+
+def test_benchmarks_run():
+    for name in ('sha256_blocks_64B', 'curve_mul_32bit'):
+        run, ops_per_call = BENCHMARKS[name]()
+        assert measure(run, ops_per_call, min_time=0.0, repeat=1) > 0
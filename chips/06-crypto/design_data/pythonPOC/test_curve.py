@@ -4,7 +4,7 @@ import pytest
 from ecpy.curves import Curve as ECPyCurve
 from ecpy.curves import Point as ECPyPoint
 
-from curve import CurveFp
+from curve import CurveFp, FixedBaseTable
 
 
 def tup_from_ecpy(P: ECPyPoint) -> tuple[int, int]:
@@ -208,3 +208,248 @@ def test_group_law_associativity_small_sample(curve, G):
 
     assert left == right
     assert curve.is_on_curve(left)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 7, 11, 42, -5, -1, 1234567890])
+def test_mul_jacobian_matches_ecpy_on_generator(curve, ecpy_curve, G, k):
+    R_ec = k_times_G(ecpy_curve, k)
+    R_py = curve.mul(k, G, method="jacobian")
+    assert R_py == tup_from_ecpy(R_ec)
+    assert curve.is_on_curve(R_py)
+
+
+def test_mul_jacobian_matches_affine(curve, some_scalars, n, G, rng):
+    P = curve.mul(rng.randrange(1, n), G)
+    for k in some_scalars:
+        assert curve.mul_jacobian(k, P) == curve.mul(k, P)
+    assert curve.mul_jacobian(0, P) is None
+    assert curve.mul_jacobian(n, P) is None
+
+
+def test_jacobian_add_matches_affine(curve, G, random_scalar_pairs):
+    for k1, k2 in random_scalar_pairs:
+        P = curve.mul(k1, G)
+        Q = curve.mul(k2, G)
+        # non trivial Z on both sides
+        P_jac = curve.jacobian_double(curve.to_jacobian(P))
+        Q_jac = curve.jacobian_double(curve.to_jacobian(Q))
+        expected = curve.add(curve.add(P, P), curve.add(Q, Q))
+        assert curve.to_affine(curve.jacobian_add(P_jac, Q_jac)) == expected
+        assert curve.to_affine(curve.jacobian_add_mixed(P_jac, Q)) == curve.add(curve.add(P, P), Q)
+    assert curve.jacobian_add(curve.to_jacobian(G), curve.jacobian_neg(curve.to_jacobian(G))) is None
+    assert curve.to_affine(curve.jacobian_add_mixed(curve.to_jacobian(G), G)) == curve.add(G, G)
+
+
+def test_mul_unknown_method_raises(curve, G):
+    with pytest.raises(ValueError):
+        curve.mul(3, G, method="magic")
+
+
+@pytest.mark.parametrize("w", [2, 3, 4, 5, 6])
+def test_wnaf_digits_reconstruct_scalar(curve, n, rng, w):
+    for k in [0, 1, 7, 255, n - 1, rng.randrange(1, n)]:
+        digits = curve.wnaf(k, w)
+        assert sum(d << i for i, d in enumerate(digits)) == k
+        assert all(d == 0 or (d % 2 == 1 and abs(d) < 1 << (w - 1)) for d in digits)
+        for i in range(len(digits)):
+            assert sum(1 for d in digits[i:i + w] if d) <= 1
+
+
+@pytest.mark.parametrize("w", [2, 3, 4, 5, 6])
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 7, 11, 42, -5, -1, 1234567890])
+def test_mul_wnaf_matches_ecpy_on_generator(curve, ecpy_curve, G, k, w):
+    R_ec = k_times_G(ecpy_curve, k)
+    assert curve.mul(k, G, method="wnaf", window=w) == tup_from_ecpy(R_ec)
+
+
+def test_mul_wnaf_random_point(curve, n, G, rng):
+    P = curve.mul_jacobian(rng.randrange(1, n), G)
+    for _ in range(5):
+        k = rng.randrange(1, n)
+        assert curve.mul_wnaf(k, P, 5) == curve.mul_jacobian(k, P)
+    assert curve.mul_wnaf(0, P) is None
+    assert curve.mul_wnaf(n, P) is None
+
+
+def test_wnaf_op_counts(curve, n, rng):
+    k = rng.randrange(1, n)
+    counts = curve.wnaf_op_counts(k, 5)
+    assert counts["binary_doublings"] == k.bit_length() - 1
+    assert counts["doublings"] in (counts["binary_doublings"], counts["binary_doublings"] + 1)
+    assert counts["additions"] < counts["binary_additions"]
+    assert counts["precomp_additions"] == 7
+
+
+@pytest.mark.parametrize("window", [1, 4, 5])
+def test_fixed_base_table_matches_mul(curve, G, n, rng, window):
+    table = FixedBaseTable(curve, G, n, window=window)
+    for k in [1, 2, 3, 42, n - 1, rng.randrange(1, n), rng.randrange(1, n)]:
+        assert table.mul(k) == curve.mul_jacobian(k, G)
+    assert table.mul(0) is None
+    assert table.mul(n) is None
+
+
+def test_fixed_base_table_persists(curve, G, n, rng, tmp_path):
+    path = str(tmp_path / "g.table")
+    table = FixedBaseTable(curve, G, n, window=3, path=path)
+    k = rng.randrange(1, n)
+    expected = table.mul(k)
+    assert (tmp_path / "g.table").stat().st_size == 4 + 1 + 32 + 86 * 7 * 64
+
+    loaded = FixedBaseTable(curve, G, n, window=3, path=path)
+    assert loaded.load() == table.rows
+    assert loaded.mul(k) == expected
+
+    # a table of another window is not reused but rebuilt
+    other = FixedBaseTable(curve, G, n, window=2, path=path)
+    assert other.load() is None
+    assert other.mul(k) == expected
+
+
+def test_fixed_base_table_corrupted_file(curve, G, n, tmp_path):
+    path = tmp_path / "g.table"
+    expected = FixedBaseTable(curve, G, n, window=3, path=str(path)).mul(12345)
+    data = path.read_bytes()
+
+    path.write_bytes(FixedBaseTable.MAGIC)  # truncated header
+    assert FixedBaseTable(curve, G, n, window=3, path=str(path)).load() is None
+
+    corrupted = bytearray(data)
+    corrupted[-1] ^= 1  # same length, one point no longer on the curve
+    path.write_bytes(bytes(corrupted))
+    table = FixedBaseTable(curve, G, n, window=3, path=str(path))
+    assert table.load() is None
+    assert table.mul(12345) == expected
+    assert path.read_bytes() == data  # rebuilt and saved again
+
+
+def test_fixed_base_table_unwritable_path(curve, G, n, tmp_path):
+    expected = curve.mul_jacobian(5, G)
+    missing_dir = FixedBaseTable(curve, G, n, window=3, path=str(tmp_path / "missing" / "g.table"))
+    assert missing_dir.mul(5) == expected
+
+    # the path is a directory: not loadable and the rename fails, no .tmp file stays behind
+    (tmp_path / "dir.table").mkdir()
+    blocked = FixedBaseTable(curve, G, n, window=3, path=str(tmp_path / "dir.table"))
+    assert blocked.load() is None
+    assert blocked.mul(5) == expected
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dir.table"]
+
+
+@pytest.mark.parametrize("w", [2, 4, 5])
+def test_mul_straus_matches_separate_muls(curve, G, n, rng, w):
+    P = curve.mul_jacobian(rng.randrange(1, n), G)
+    Q = curve.mul_jacobian(rng.randrange(1, n), G)
+    for k1, k2, k3 in [(1, 1, 1), (rng.randrange(1, n), rng.randrange(1, n), rng.randrange(1, n)),
+                       (-5, 7, 0), (3, n - 3, 1), (2**200, 1, -(2**10))]:
+        expected = curve.add(curve.add(curve.mul(k1, G), curve.mul(k2, P)), curve.mul(k3, Q))
+        assert curve.mul_straus([k1, k2, k3], [G, P, Q], w) == expected
+
+
+def test_mul_straus_degenerate(curve, G, n):
+    assert curve.mul_straus([], []) is None
+    assert curve.mul_straus([0, 5], [G, None]) is None
+    assert curve.mul_straus([1, n - 1], [G, G]) is None
+    with pytest.raises(ValueError):
+        curve.mul_straus([1, 2], [G])
+
+
+def test_glv_endomorphism_is_lambda_mul(curve, ecpy_curve, G, n):
+    assert curve.n == n
+    assert curve.endomorphism(G) == tup_from_ecpy(k_times_G(ecpy_curve, curve.lam))
+    assert curve.endomorphism(None) is None
+
+
+def test_glv_split_is_short(curve, n, rng):
+    for k in [0, 1, n - 1, curve.lam] + [rng.randrange(1, n) for _ in range(200)]:
+        k1, k2 = curve.glv_split(k)
+        assert (k1 + k2 * curve.lam - k) % n == 0
+        assert abs(k1).bit_length() <= 129 and abs(k2).bit_length() <= 129
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 7, 11, 42, -5, -1, 1234567890])
+def test_mul_glv_matches_ecpy_on_generator(curve, ecpy_curve, G, k):
+    R_ec = k_times_G(ecpy_curve, k)
+    assert curve.mul(k, G, method="glv") == tup_from_ecpy(R_ec)
+
+
+def test_mul_glv_matches_ecpy_on_random_point(curve, ecpy_curve, n, rng):
+    P_ec = k_times_G(ecpy_curve, rng.randrange(1, n))
+    P_py = tup_from_ecpy(P_ec)
+    for _ in range(5):
+        k = rng.randrange(1, n)
+        assert curve.mul_glv(k, P_py, 5) == tup_from_ecpy(k * P_ec)
+    assert curve.mul_glv(n, P_py) is None
+
+
+def test_inv_many_matches_pow(curve, n, rng):
+    p = curve.p
+    values = [1, 2, p - 1] + [rng.randrange(1, p) for _ in range(20)]
+    assert curve.inv_many(values, p) == [pow(v, p - 2, p) for v in values]
+    assert curve.inv_many([3, 5], n) == [pow(3, -1, n), pow(5, -1, n)]
+    assert curve.inv_many([], p) == []
+    with pytest.raises(ZeroDivisionError):
+        curve.inv_many([3, 0, 5], p)
+
+
+def test_normalize_many_matches_to_affine(curve, G, n, rng):
+    points = [curve.jacobian_double(curve.to_jacobian(curve.mul_jacobian(rng.randrange(1, n), G)))
+              for _ in range(10)]
+    points.insert(3, None)
+    assert curve.normalize_many(points) == [curve.to_affine(P) for P in points]
+    assert curve.normalize_many([]) == []
+
+
+def test_mul_many_matches_mul(curve, G, n, rng):
+    scalars = [1, 2, n - 1, n] + [rng.randrange(1, n) for _ in range(10)]
+    assert curve.mul_many(scalars, G) == [curve.mul_jacobian(k, G) for k in scalars]
+    table = FixedBaseTable(curve, G, n, window=4)
+    assert table.mul_many(scalars) == [curve.mul_jacobian(k, G) for k in scalars]
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 3, 7, 42, -5, 1234567890])
+def test_mul_ladder_matches_ecpy_on_generator(curve, ecpy_curve, G, k):
+    R = curve.mul(k, G, method="ladder")
+    assert R == (None if k == 0 else tup_from_ecpy(k_times_G(ecpy_curve, k)))
+
+
+def test_mul_ladder_edge_scalars(curve, G, n, rng):
+    P = curve.mul_jacobian(rng.randrange(1, n), G)
+    for k in [n - 2, n - 1, n, n + 1, 2**256 - n - 1, 2**256 - n] + [rng.randrange(1, n) for _ in range(5)]:
+        assert curve.mul_ladder(k, P) == curve.mul_jacobian(k % n, P)
+
+
+def test_cswap(curve):
+    A, B = (1, 2), (3, 4)
+    assert curve.cswap(0, A, B) == (A, B)
+    assert curve.cswap(1, A, B) == (B, A)
+    assert curve.inv_mod_fermat(3, curve.p) == curve.inv_mod_binary(3, curve.p)
+
+
+def test_multi_mul_matches_straus(curve, G, n, rng):
+    points = curve.mul_many([rng.randrange(1, n) for _ in range(40)], G)
+    points[5] = points[6]  # same point twice
+    points[7] = None
+    scalars = [rng.randrange(1, n) for _ in points]
+    scalars[0], scalars[1], scalars[2] = 0, n, -3
+    expected = curve.mul_straus(scalars, points)
+    assert curve.multi_mul(scalars, points) == expected
+    for window in (1, 3, 8):
+        assert curve.multi_mul(scalars, points, window) == expected
+    assert curve.multi_mul([n - 1, 1], [G, G]) is None
+    assert curve.multi_mul([], []) is None
+
+
+def test_pippenger_window_grows_with_batch(curve):
+    windows = [curve.pippenger_window(count) for count in (1, 10, 100, 1000, 10000)]
+    assert windows == sorted(windows)
+    assert windows[0] < windows[-1]
+
+
+def test_lift_x(curve, G, n, rng):
+    for k in [1, 2] + [rng.randrange(1, n) for _ in range(5)]:
+        x, y = curve.mul_jacobian(k, G)
+        assert curve.lift_x(x, y) == (x, y)
+        assert curve.lift_x(x, y + 1) == curve.neg((x, y))
+    assert curve.lift_x(curve.p, 0) is None
+    assert sum(curve.lift_x(x, 0) is None for x in range(1, 50)) > 10  # about half of all x have no point
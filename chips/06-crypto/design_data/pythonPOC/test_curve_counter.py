@@ -0,0 +1,54 @@
+from curve import CurveFp
+from curve_counter import CostModel, CountingCurveFp, FORMULA_COSTS
+from ecdsa import Ecdsa
+
+
+def test_counting_curve_same_results():
+    curve = CurveFp()
+    counting = CountingCurveFp()
+    G = Ecdsa().generator
+    k = 0xDEADBEEF1234567890
+    for method in ("affine", "jacobian", "wnaf", "glv", "ladder"):
+        assert counting.mul(k, G, method=method) == curve.mul(k, G, method=method)
+    for a in (1, 2, 12345, curve.p - 1):
+        assert counting.inv_mod_binary(a, curve.p) == curve.inv_mod_binary(a, curve.p)
+
+
+def test_formula_counts():
+    curve = CountingCurveFp()
+    G = Ecdsa().generator
+    with curve.measure() as counts:
+        curve.jacobian_double(curve.to_jacobian(G))
+    assert counts["jacobian_double"] == 1
+    for op, amount in FORMULA_COSTS["jacobian_double"].items():
+        assert counts[op] == amount
+    assert counts["inv"] == 0
+
+    with curve.measure() as counts:
+        curve.to_affine(curve.jacobian_double(curve.to_jacobian(G)))
+    assert counts["inv"] == 1
+    assert counts["inv_iterations"] > 0
+
+    # infinity inputs cost nothing
+    with curve.measure() as counts:
+        curve.jacobian_add(None, curve.to_jacobian(G))
+        curve.add(G, None)
+    assert counts["mul"] == counts["sqr"] == counts["add"] == 0
+
+
+def test_counts_verify_and_cost_model():
+    curve = CountingCurveFp()
+    ecdsa = Ecdsa(ec_curve=curve)
+    privkey = 0x1234567890ABCDEF
+    pubkey = curve.mul(privkey, ecdsa.generator, method="glv")
+    sig = ecdsa.sign("counted", privkey)
+
+    curve.reset_counts()
+    assert ecdsa.verify("counted", sig, pubkey)
+    counts = dict(curve.counts)
+    assert counts["jacobian_double"] > 100
+    assert counts["inv"] >= 2  # s^-1 mod n and the final to_affine
+
+    model = CostModel(mul=1, sqr=0, add=0, inv_iteration=0)
+    assert model.cycles(counts) == counts["mul"]
+    assert CostModel().cycles(counts) > model.cycles(counts)
@@ -1,3 +1,4 @@
+import io
 import random
 import hashlib
 import ecpy
@@ -5,7 +6,9 @@ import pytest
 
 from ecpy.ecdsa import ECDSA as ECPyecdsa, ECPrivateKey, decode_sig, encode_sig
 from ecpy.curves import Curve as ECPyCurve
-from ecdsa import Ecdsa
+from curve import FixedBaseTable
+from ecdsa import Ecdsa, NoncePool, PubkeyTableCache
+from sha256 import SHA256
 
 num_test = 1000
 
@@ -60,3 +63,152 @@ def test_ecdsa_againt_ecpy_with_k1():
     assert ECPyecdsa().verify(
         msg_hash, encode_sig(sig[0], sig[1]), ecpy_privkey.get_public_key()
     )
+
+
+def test_ecdsa_sign_many_same_as_sign():
+    privkey = random.randint(1, 2**256)
+    pubkey = ecdsa.ec_curve.mul(privkey, ecdsa.generator, method="glv")
+    msgs = [str(random.randint(1, 2**512)) for _ in range(20)]
+    ks = [random.randint(1, 2**256) for _ in msgs]
+
+    sigs = ecdsa.sign_many(msgs, privkey, ks)
+    assert sigs == [ecdsa.sign(msg, privkey, k) for msg, k in zip(msgs, ks)]
+    assert all(ecdsa.verify(msg, sig, pubkey) for msg, sig in zip(msgs, sigs))
+    assert len(ecdsa.sign_many(msgs, privkey)) == len(msgs)
+
+
+def test_ecdsa_sign_recoverable():
+    privkey = random.randint(1, 2**256)
+    k = random.randint(1, 2**256)
+    r, s, v = ecdsa.sign("recoverable", privkey, k, recoverable=True)
+    assert (r, s) == ecdsa.sign("recoverable", privkey, k)
+    R = ecdsa.ec_curve.mul(k, ecdsa.generator, method="glv")
+    assert R == ecdsa.ec_curve.lift_x(r + (ecdsa.order if v & 2 else 0), v)
+    assert ecdsa.sign_many(["recoverable"], privkey, [k], recoverable=True) == [(r, s, v)]
+
+
+def test_ecdsa_verify_batch():
+    keys = [random.randint(1, 2**256) for _ in range(3)]
+    pubkeys = [ecdsa.ec_curve.mul(privkey, ecdsa.generator, method="glv") for privkey in keys]
+    msgs = [str(random.randint(1, 2**512)) for _ in range(70)]
+    signers = [i % 3 for i in range(len(msgs))]
+    sigs = [ecdsa.sign(msg, keys[j], recoverable=True) for msg, j in zip(msgs, signers)]
+    pubs = [pubkeys[j] for j in signers]
+    assert ecdsa.verify_batch(msgs, sigs, pubs) == [True] * len(msgs)
+    assert ecdsa.verify_batch(msgs[:5], sigs[:5], pubs[:5]) == [True] * 5
+    assert ecdsa.verify_batch([], [], []) == []
+
+    bad = list(sigs)
+    bad[3] = (bad[3][0], bad[3][1] + 1, bad[3][2])  # invalid
+    bad[10] = (bad[10][0], bad[10][1], bad[10][2] ^ 1)  # wrong recovery id, still valid
+    bad[20] = bad[20][:2]  # plain signature
+    bad[30] = (bad[30][0], 0, bad[30][2])  # s out of range
+    bad[31] = (bad[31][0], 0)  # plain signature, s out of range
+    bad[32] = (0, bad[32][1])  # plain signature, r out of range
+    wrong_key = list(pubs)
+    wrong_key[40] = pubkeys[(signers[40] + 1) % 3]
+    wrong_key[50] = list(wrong_key[50])  # list pubkeys work like tuples
+    expected = [True] * len(msgs)
+    expected[3] = expected[30] = expected[31] = expected[32] = expected[40] = False
+    assert ecdsa.verify_batch(msgs, bad, wrong_key) == expected
+
+
+def test_ecdsa_verify_rejects_out_of_range():
+    privkey = random.randint(1, 2**256)
+    pubkey = ecdsa.ec_curve.mul(privkey, ecdsa.generator, method="glv")
+    r, s = ecdsa.sign("range", privkey)
+    for sig in [(r, 0), (0, s), (r, ecdsa.order), (ecdsa.order, s)]:
+        with pytest.raises(ValueError):
+            ecdsa.verify("range", sig, pubkey)
+
+
+def test_ecdsa_nonce_pool():
+    signer = Ecdsa()
+    privkey = random.randint(1, 2**256)
+    pubkey = signer.ec_curve.mul(privkey, signer.generator, method="glv")
+
+    with pytest.raises(ValueError):
+        NoncePool(signer, depth=8, low_watermark=8, start=False)
+    pool = NoncePool(signer, depth=8, low_watermark=2, batch=4, start=False)
+    assert len(pool) == 0
+    pool.fill()
+    assert len(pool) == 8
+    k, k_inv, r, v = pool.take()
+    assert (k * k_inv) % signer.order == 1
+    assert signer.ec_curve.mul(k, signer.generator, method="glv")[0] % signer.order == r
+
+    signer.nonce_pool = pool
+    sigs = [signer.sign(str(i), privkey, recoverable=True) for i in range(12)]
+    assert pool.hits == 8 and pool.misses == 5  # no worker, the pool ran dry
+    assert all(signer.verify(str(i), sig[:2], pubkey) for i, sig in enumerate(sigs))
+    assert signer.verify_batch([str(i) for i in range(12)], sigs, [pubkey] * 12) == [True] * 12
+
+    pool.start()
+    for i in range(30):
+        assert signer.verify(str(i), signer.sign(str(i), privkey), pubkey)
+    pool.close()
+    assert pool.hits + pool.misses == 12 + 30 + 1
+
+
+def test_ecdsa_pubkey_table_cache():
+    verifier = Ecdsa()
+    keys = [random.randint(1, 2**256) for _ in range(3)]
+    pubkeys = [verifier.ec_curve.mul(privkey, verifier.generator, method="glv") for privkey in keys]
+    # room for two tables of window 4 (64 rows of 15 points), about 2.8 times the raw coordinates
+    table_bytes = FixedBaseTable(verifier.ec_curve, pubkeys[0], verifier.order, window=4).memory_bytes
+    assert table_bytes > 2.5 * 64 * 15 * 64
+    cache = PubkeyTableCache(verifier, max_bytes=table_bytes * 5 // 2, window=4)
+    verifier.pubkey_cache = cache
+
+    for i in range(6):
+        msg = str(random.randint(1, 2**512))
+        sig = verifier.sign(msg, keys[i % 2])
+        assert verifier.verify(msg, sig, pubkeys[i % 2])
+        assert not verifier.verify(msg, (sig[0], sig[1] + 1), pubkeys[i % 2])
+    stats = cache.stats()
+    assert stats.pop("bytes") == cache.get(pubkeys[0]).memory_bytes + cache.get(pubkeys[1]).memory_bytes
+    assert stats == {"tables": 2, "hits": 10, "misses": 2, "evictions": 0}
+
+    msg = "third key"
+    sig = verifier.sign(msg, keys[2])
+    assert verifier.verify(msg, sig, pubkeys[2])  # drops key 0, the least recently used
+    assert pubkeys[0] not in cache and pubkeys[1] in cache
+    assert not verifier.verify(msg, sig, pubkeys[0])  # drops key 1
+    assert cache.stats()["evictions"] == 2
+    assert pubkeys[1] not in cache and pubkeys[0] in cache and pubkeys[2] in cache
+    assert cache.get(pubkeys[2]).mul(keys[0]) == verifier.ec_curve.mul(keys[0], pubkeys[2], method="glv")
+
+    # a pubkey given as list works like the tuple
+    assert verifier.verify(msg, sig, list(pubkeys[2]))
+    assert list(pubkeys[2]) in cache
+
+
+def test_ecdsa_bytes_stream_and_digest():
+    privkey = random.randint(1, 2**256)
+    pubkey = ecdsa.ec_curve.mul(privkey, ecdsa.generator, method="glv")
+    data = random.randbytes(200_000)
+    digest = hashlib.sha256(data).digest()
+    k = random.randint(1, 2**256)
+
+    sig = ecdsa.sign_digest(digest, privkey, k)
+    assert sig == ecdsa.sign(data, privkey, k)
+    assert sig == ecdsa.sign(io.BytesIO(data), privkey, k)
+    assert sig == ecdsa.sign((data[i:i + 1000] for i in range(0, len(data), 1000)), privkey, k)
+    assert sig == ecdsa.sign_digest(int.from_bytes(digest, "big"), privkey, k)
+    assert ecdsa.sign("text", privkey, k) == ecdsa.sign(io.StringIO("text"), privkey, k)
+    assert ecdsa.sign("text", privkey, k) == ecdsa.sign(["te", b"xt"], privkey, k)
+
+    assert ecdsa.verify(memoryview(data), sig, pubkey)
+    assert ecdsa.verify(io.BytesIO(data), sig, pubkey)
+    assert ecdsa.verify_digest(digest, sig, pubkey)
+    for wrong in [b'\x01' * 64, digest.hex().encode(), digest[:31], -1, 2**256]:
+        with pytest.raises(ValueError):
+            ecdsa.sign_digest(wrong, privkey, k)
+        with pytest.raises(ValueError):
+            ecdsa.verify_digest(wrong, sig, pubkey)
+    assert not ecdsa.verify(data[1:], sig, pubkey)
+    assert ecdsa.verify_batch([io.BytesIO(data)], [ecdsa.sign(data, privkey, recoverable=True)], [pubkey]) == [True]
+
+    # the pythonPOC SHA256 as hasher gives the same signatures
+    assert Ecdsa(hasher=SHA256).sign(data[:5000], privkey, k) == ecdsa.sign_digest(
+        hashlib.sha256(data[:5000]).digest(), privkey, k)
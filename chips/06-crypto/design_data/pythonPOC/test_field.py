@@ -0,0 +1,52 @@
+import random
+import pytest
+
+from curve import CurveFp
+from field import Secp256k1Field
+
+field = Secp256k1Field()
+p = field.p
+
+
+def test_field_prime_matches_curve():
+    assert p == CurveFp().p
+    assert 2**256 % p == field.C
+
+
+@pytest.mark.parametrize("x", [0, 1, p - 1, p, p + 1, 2**256 - 1, 2**256, (p - 1) ** 2, 2**512 - 1])
+def test_reduce_edge_cases(x):
+    assert field.reduce(x) == x % p
+    assert field.reduce_steps(x)["result"] == x % p
+
+
+def test_reduce_random_products():
+    for _ in range(2000):
+        a = random.randrange(p)
+        b = random.randrange(p)
+        assert field.mul(a, b) == (a * b) % p
+        x = random.getrandbits(512)
+        assert field.reduce_steps(x)["result"] == x % p
+
+
+def test_reduce_steps_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        field.reduce_steps(2**512)
+    with pytest.raises(ValueError):
+        field.reduce_steps(-1)
+
+
+def test_reduce_steps_checks_register_widths():
+    class NarrowField(Secp256k1Field):
+        WIDTHS = {**Secp256k1Field.WIDTHS, "hi2": 32}
+
+    with pytest.raises(ValueError, match="hi2"):
+        NarrowField().reduce_steps(2**512 - 1)
+
+
+def test_add_sub_sqr():
+    for _ in range(200):
+        a = random.randrange(p)
+        b = random.randrange(p)
+        assert field.add(a, b) == (a + b) % p
+        assert field.sub(a, b) == (a - b) % p
+        assert field.sqr(a) == (a * a) % p
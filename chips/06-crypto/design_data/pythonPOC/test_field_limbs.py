@@ -0,0 +1,53 @@
+import random
+
+from curve import CurveFp
+from field_limbs import LimbField
+
+field = LimbField()
+p = field.p
+
+
+def random_elements(count: int) -> list[int]:
+    return [0, 1, p - 1, 2**256 - 2**32 - 978] + [random.randrange(p) for _ in range(count)]
+
+
+def test_limb_roundtrip():
+    values = random_elements(20)
+    assert field.from_limbs(field.to_limbs(values)) == values
+
+
+def test_limb_mul_add_sub():
+    a = random_elements(200)
+    b = random_elements(200)
+    A = field.to_limbs(a)
+    B = field.to_limbs(b)
+    for result, expected in [
+        (field.mul(A, B), [(x * y) % p for x, y in zip(a, b)]),
+        (field.sqr(A), [(x * x) % p for x in a]),
+        (field.add(A, B), [(x + y) % p for x, y in zip(a, b)]),
+        (field.sub(A, B), [(x - y) % p for x, y in zip(a, b)]),
+        (field.mul_small(A, 8), [(x * 8) % p for x in a]),
+    ]:
+        assert (result < 2**26).all()
+        assert [x % p for x in field.from_limbs(result)] == expected
+        assert field.from_limbs(field.normalize(result)) == expected
+
+
+def test_limb_mul_steps_widths():
+    A = field.to_limbs([p - 1] * 4)
+    steps = field.mul_steps(A, A)
+    assert (steps["columns"] < 10 * 2**52).all()
+    assert (steps["product"] < 2**26).all()
+    assert field.from_limbs(steps["product"])[0] == (p - 1) ** 2
+    assert field.from_limbs(field.normalize(steps["result"]))[0] == 1
+
+
+def test_jacobian_double_many_matches_curve():
+    curve = CurveFp()
+    G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+         0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+    points = [curve.jacobian_double(curve.to_jacobian(curve.mul_jacobian(random.randrange(1, p), G)))
+              for _ in range(20)]
+    X, Y, Z = (field.to_limbs([P[i] for P in points]) for i in range(3))
+    doubled = [field.from_limbs(field.normalize(limbs)) for limbs in field.jacobian_double_many(X, Y, Z)]
+    assert list(zip(*doubled)) == [curve.jacobian_double(P) for P in points]
@@ -0,0 +1,18 @@
+import random
+import pytest
+
+from hash_file import hash_file
+
+from hashlib import sha256 as libsha256
+
+
+@pytest.mark.parametrize("length", [0, 1, 63, 64, 65, 5000])
+def test_hash_file_matches_hashlib(tmp_path, length):
+    data = random.randbytes(length)
+    path = tmp_path / "blob.bin"
+    path.write_bytes(data)
+
+    digest, size, seconds = hash_file(str(path))
+    assert digest == libsha256(data).digest()
+    assert size == length
+    assert seconds >= 0
@@ -0,0 +1,71 @@
+import random
+import pytest
+
+from merkle import MerkleTree
+from sha256_batch import SHA256Batch
+
+from hashlib import sha256 as libsha256
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    level = [libsha256(b'\x00' + leaf).digest() for leaf in leaves]
+    while len(level) > 1:
+        parents = [libsha256(b'\x01' + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 33])
+def test_merkle_root_matches_hashlib(count):
+    leaves = [random.randbytes(random.randint(0, 100)) for _ in range(count)]
+    tree = MerkleTree(leaves)
+    assert tree.root == merkle_root(leaves)
+    assert tree.hash_count == count + sum(len(level) // 2 for level in tree.levels[:-1])
+    assert tree.hash_count <= 2 * count - 1
+
+
+def test_merkle_batch_backend():
+    leaves = [random.randbytes(32) for _ in range(20)]
+    assert MerkleTree(leaves, hasher=SHA256Batch().digest).root == merkle_root(leaves)
+
+
+@pytest.mark.parametrize("count", [1, 5, 16])
+def test_merkle_update_rehashes_only_the_path(count):
+    leaves = [random.randbytes(32) for _ in range(count)]
+    tree = MerkleTree(leaves)
+    for index in range(count):
+        leaves[index] = random.randbytes(32)
+        before = tree.hash_count
+        assert tree.update(index, leaves[index]) == merkle_root(leaves)
+        assert tree.hash_count - before <= len(tree.levels)
+
+
+def test_merkle_update_does_not_use_backend():
+    calls = []
+
+    def backend(msgs):
+        calls.append(len(msgs))
+        return SHA256Batch().digest(msgs)
+
+    leaves = [random.randbytes(32) for _ in range(9)]
+    tree = MerkleTree(leaves, hasher=backend)
+    level_calls = len(calls)
+    leaves[4] = b'changed'
+    assert tree.update(4, leaves[4]) == merkle_root(leaves)
+    assert len(calls) == level_calls
+
+
+def test_merkle_update_rejects_bad_index():
+    leaves = [random.randbytes(32) for _ in range(5)]
+    tree = MerkleTree(leaves)
+    for index in (-1, 5):
+        with pytest.raises(IndexError):
+            tree.update(index, b'x')
+    assert tree.root == merkle_root(leaves)
+
+
+def test_merkle_needs_leaves():
+    with pytest.raises(ValueError):
+        MerkleTree([])
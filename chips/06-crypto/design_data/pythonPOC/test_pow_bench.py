@@ -0,0 +1,27 @@
+import random
+
+from pow_bench import double_sha256_batch, double_sha256_hashlib, double_sha256_python, meets_target
+from sha256_batch import SHA256Batch
+
+from hashlib import sha256 as libsha256
+
+
+def test_double_sha256_backends_agree():
+    header = random.randbytes(80)
+    nonces = range(1000, 1020)
+    expected = [libsha256(libsha256(header[:76] + nonce.to_bytes(4, byteorder='little')).digest()).digest()
+                for nonce in nonces]
+    assert double_sha256_python(header, nonces) == expected
+    assert double_sha256_batch(header, nonces) == expected
+    assert double_sha256_hashlib(header, nonces) == expected
+
+
+def test_double_sha256_batch_in_chunks():
+    header = random.randbytes(80)
+    nonces = range(7, 50, 3)
+    assert double_sha256_batch(header, nonces, SHA256Batch(batch_size=4)) == double_sha256_hashlib(header, nonces)
+
+
+def test_meets_target():
+    assert meets_target(bytes(31) + b'\x01', 7)
+    assert not meets_target(bytes(31) + b'\x01', 8)
@@ -1,7 +1,7 @@
 import random
 import pytest
 
-from sha256 import SHA256
+from sha256 import MidstateCache, SHA256
 
 from hashlib import sha256 as libsha256
 
@@ -29,3 +29,111 @@ def test_sha256_against_known_hash():
     msg = bytes()
     hash = SHA256().hash(msg)
     assert hash == 0xe3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855
+
+
+@pytest.mark.parametrize("length", [0, 1, 55, 56, 60, 63, 64, 65, 127, 128, 1000])
+def test_sha256_padding_lengths(length):
+    msg = random.randbytes(length)
+    lib_hash = int.from_bytes(libsha256(msg).digest(), byteorder='big')
+    assert SHA256().hash(msg) == lib_hash
+
+
+def test_sha256_update_random_pieces():
+    for _ in range(0, 100):
+        msg = random.randbytes(random.randint(0, 1000))
+        sha256 = SHA256()
+        i = 0
+        while i < len(msg):
+            step = random.randint(0, 130)
+            sha256.update(msg[i:i + step])
+            i += step
+        assert sha256.digest() == libsha256(msg).digest()
+        assert sha256.hexdigest() == libsha256(msg).hexdigest()
+
+
+def test_sha256_digest_does_not_finalize():
+    sha256 = SHA256()
+    sha256.update(b"abc")
+    assert sha256.digest() == libsha256(b"abc").digest()
+    sha256.update(b"def")
+    assert sha256.digest() == libsha256(b"abcdef").digest()
+
+
+def test_sha256_copy_is_independent():
+    prefix = random.randbytes(100)
+    sha256 = SHA256()
+    sha256.update(prefix)
+    clone = sha256.copy()
+    clone.update(b"suffix")
+    assert sha256.digest() == libsha256(prefix).digest()
+    assert clone.digest() == libsha256(prefix + b"suffix").digest()
+
+
+def test_sha256_unrolled_matches_reference():
+    unrolled = SHA256()
+    reference = SHA256()
+    for _ in range(0, 100):
+        chunk = random.randbytes(64)
+        unrolled._unrolled_hash_chunk(chunk)
+        reference._reference_hash_chunk(chunk)
+        assert unrolled._get_hash() == reference._get_hash()
+
+
+def test_sha256_midstate_roundtrip():
+    prefix = random.randbytes(128)
+    sha256 = SHA256()
+    sha256.update(prefix)
+    state, length = sha256.export_midstate()
+    assert length == 128 * 8
+
+    seeded = SHA256()
+    seeded.import_midstate(state, length)
+    seeded.update(b"suffix")
+    assert seeded.digest() == libsha256(prefix + b"suffix").digest()
+
+    # the chip style path continues from the midstate as well
+    seeded = SHA256()
+    seeded.import_midstate(state, length)
+    assert seeded.hash(b"suffix") == int.from_bytes(libsha256(prefix + b"suffix").digest(), byteorder='big')
+
+
+def test_sha256_midstate_needs_block_boundary():
+    sha256 = SHA256()
+    sha256.update(b"abc")
+    with pytest.raises(ValueError):
+        sha256.export_midstate()
+    with pytest.raises(ValueError):
+        sha256.import_midstate((0,) * 8, 24)
+
+
+def test_midstate_cache_hits_and_eviction():
+    cache = MidstateCache(maxsize=2)
+    headers = [random.randbytes(100) for _ in range(3)]
+    for header in headers[:2]:
+        for suffix in (b"a", b"bb", b"ccc"):
+            assert cache.digest(header, suffix) == libsha256(header + suffix).digest()
+    assert (cache.hits, cache.misses) == (4, 2)
+
+    cache.digest(headers[2], b"")
+    assert len(cache) == 2
+    cache.digest(headers[0], b"")
+    assert cache.misses == 4  # headers[0] was the least recently used one
+
+
+def test_sha256_trace():
+    msg = random.randbytes(100)
+    sha256 = SHA256(trace=True)
+    sha256.hash(msg)
+    trace = sha256.get_trace()
+    assert len(trace) == 2
+    assert all(rounds.shape == (64, 9) for rounds in trace)
+
+    # round 0 starts from the initial hash, w[0..15] is the block itself
+    assert list(trace[0][0, :8]) == list(SHA256().export_midstate()[0])
+    assert trace[0][:16, 8].astype('>u4').tobytes() == msg[:64]
+
+    # the second block starts from the result of the first one
+    first = SHA256()
+    first.hash_chunk(msg[:64])
+    assert list(trace[1][0, :8]) == list(first.export_midstate()[0])
+    assert SHA256().get_trace() == []
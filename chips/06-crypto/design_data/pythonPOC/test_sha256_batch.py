@@ -0,0 +1,27 @@
+import random
+import pytest
+
+from sha256 import SHA256
+from sha256_batch import SHA256Batch
+
+from hashlib import sha256 as libsha256
+
+
+@pytest.mark.parametrize("length", [0, 1, 55, 56, 63, 64, 65, 128, 1000])
+def test_sha256_batch_equal_lengths(length):
+    msgs = [random.randbytes(length) for _ in range(50)]
+    assert SHA256Batch().digest(msgs) == [libsha256(msg).digest() for msg in msgs]
+
+
+def test_sha256_batch_mixed_lengths_keep_order():
+    msgs = [random.randbytes(random.randint(0, 300)) for _ in range(500)]
+    assert SHA256Batch(batch_size=64).digest(msgs) == [libsha256(msg).digest() for msg in msgs]
+
+
+def test_sha256_batch_matches_reference_model():
+    msgs = [random.randbytes(100) for _ in range(10)]
+    assert SHA256Batch().hash(msgs) == [SHA256().hash(msg) for msg in msgs]
+
+
+def test_sha256_batch_empty():
+    assert SHA256Batch().digest([]) == []
@@ -0,0 +1,29 @@
+import random
+
+from sha256_parallel import ParallelHasher
+
+from hashlib import sha256 as libsha256
+
+
+def test_parallel_hasher_keeps_order():
+    msgs = [random.randbytes(random.randint(0, 200)) for _ in range(200)]
+    with ParallelHasher(workers=2, chunksize=16) as hasher:
+        assert hasher.hash(msgs) == [libsha256(msg).digest() for msg in msgs]
+
+    assert sum(stats.messages for stats in hasher.worker_stats.values()) == len(msgs)
+    assert sum(stats.bytes for stats in hasher.worker_stats.values()) == sum(len(msg) for msg in msgs)
+
+
+def test_parallel_hasher_empty():
+    with ParallelHasher(workers=2) as hasher:
+        assert hasher.hash([]) == []
+
+
+def test_parallel_hasher_reuses_pool():
+    msgs = [random.randbytes(64) for _ in range(20)]
+    with ParallelHasher(workers=2, chunksize=5) as hasher:
+        assert hasher.hash(msgs) == [libsha256(msg).digest() for msg in msgs]
+        pool = hasher._pool
+        assert hasher.hash(msgs[:3]) == [libsha256(msg).digest() for msg in msgs[:3]]
+        assert hasher._pool is pool
+    assert hasher._pool is None
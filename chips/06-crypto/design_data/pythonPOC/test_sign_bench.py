@@ -0,0 +1,19 @@
+import pytest
+
+from ecdsa import Ecdsa
+from sign_bench import percentiles, sign_latencies
+
+
+def test_percentiles():
+    values = [float(i) for i in range(1, 1001)]
+    result = percentiles(values, (50, 99))
+    assert 499 <= result[50] <= 501
+    assert 989 <= result[99] <= 991
+    assert percentiles([2.0], (50, 99)) == {50: 2.0, 99: 2.0}
+    with pytest.raises(ValueError):
+        percentiles([])
+
+
+def test_sign_latencies():
+    latencies = sign_latencies(Ecdsa(), 12345, 3)
+    assert len(latencies) == 3 and all(t > 0 for t in latencies)
@@ -0,0 +1,18 @@
+import random
+
+from ecdsa import Ecdsa
+from timing_bench import model_cycles, spread, bench_scalars, wall_times
+
+
+def test_ladder_model_cycles_are_fixed():
+    G = Ecdsa().generator
+    scalars = bench_scalars(Ecdsa().order, 4, random.Random(1))
+    assert len(set(model_cycles("ladder", scalars, G))) == 1
+    assert len(set(model_cycles("jacobian", scalars, G))) > 1
+
+
+def test_spread_and_wall_times():
+    stats = spread([1.0, 2.0, 3.0])
+    assert stats["mean"] == 2.0 and stats["min"] == 1.0 and stats["max"] == 3.0
+    assert 0.4 < stats["cv"] < 0.41
+    assert all(t > 0 for t in wall_times("ladder", [5, 7], Ecdsa().generator, repeat=1))
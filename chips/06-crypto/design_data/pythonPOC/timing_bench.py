@@ -0,0 +1,77 @@
+import argparse
+import random
+import statistics
+import time
+
+from curve_counter import CostModel, CountingCurveFp
+from ecdsa import Ecdsa
+
+
+def bench_scalars(n: int, count: int, rng: random.Random) -> list[int]:
+    """Random scalars mixed with short and low/high Hamming weight ones, the cases a leak shows up first."""
+    scalars = [rng.randrange(1, n) for _ in range(count)]
+    scalars += [rng.getrandbits(64) | 1 for _ in range(count // 4)]
+    scalars += [1 << rng.randrange(1, 255) for _ in range(count // 4)]
+    scalars += [(1 << 255) - 1 - (1 << rng.randrange(1, 255)) for _ in range(count // 4)]
+    return scalars
+
+
+def spread(values: list[float]) -> dict[str, float]:
+    """Mean, standard deviation, coefficient of variation and range of per scalar measurements."""
+    mean = statistics.fmean(values)
+    stdev = statistics.pstdev(values)
+    return {"mean": mean, "stdev": stdev, "cv": stdev / mean if mean else 0.0,
+            "min": min(values), "max": max(values)}
+
+
+def model_cycles(method: str, scalars: list[int], P, model: CostModel | None = None) -> list[int]:
+    """Estimated accelerator cycles of k*P for every scalar, from the field operation counts."""
+    model = model or CostModel()
+    curve = CountingCurveFp()
+    cycles = []
+    for k in scalars:
+        with curve.measure() as counts:
+            curve.mul(k, P, method=method)
+        cycles.append(model.cycles(counts))
+    return cycles
+
+
+def wall_times(method: str, scalars: list[int], P, repeat: int = 3) -> list[float]:
+    """Best of repeat runtimes of k*P in seconds for every scalar."""
+    curve = Ecdsa().ec_curve
+    times = []
+    for k in scalars:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            curve.mul(k, P, method=method)
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='timing_bench',
+        description='Runtime variance of scalar multiplication across scalars, modeled cycles and wall time'
+    )
+
+    parser.add_argument('--scalars', type=int, default=40, help='random full length scalars, plus special ones')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per scalar, the best one counts')
+    parser.add_argument('--methods', nargs='+', default=["jacobian", "wnaf", "glv", "ladder"])
+    parser.add_argument('--seed', type=int, default=1337)
+
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    G = Ecdsa().generator
+    scalars = bench_scalars(CountingCurveFp().n, args.scalars, rng)
+
+    print(f"{len(scalars)} scalars")
+    for method in args.methods:
+        cycles = spread(model_cycles(method, scalars, G))
+        times = spread(wall_times(method, scalars, G, args.repeat))
+        fixed = "fixed" if cycles["min"] == cycles["max"] else "VARIES"
+        print(f"{method:<9} model {cycles['min']:>8.0f} .. {cycles['max']:>8.0f} cycles ({fixed})  "
+              f"wall {times['mean'] * 1e3:7.2f} ms +- {times['stdev'] * 1e3:5.2f} (cv {times['cv']:.1%}, "
+              f"{times['min'] * 1e3:.2f} .. {times['max'] * 1e3:.2f})")